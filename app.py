@@ -78,6 +78,7 @@ st.markdown(
     - **Cumulative Returns** – Long-term growth trends  
     - **Sector Performance** – Industry-level insights  
     - **Correlation Heatmap** – Portfolio diversification analysis  
+    - **Technical Indicators** – Moving averages, RSI, Bollinger bands, ATR  
     """
 )
 
@@ -0,0 +1,195 @@
+"""
+Headless benchmark for the dashboard's page computations (no browser or
+Streamlit runtime needed).
+
+Builds synthetic long-format frames (Ticker, date, month, OHLC, volume)
+for each scale (N tickers x M trading days), prepared the way the
+dashboard loads them (prepare_frame; with the ETL's derived columns
+unless --raw), and runs every computation the pages call:
+- utils.analytics: yearly_returns, volatility, cumulative_returns,
+  top_cumulative, sector_performance, returns_matrix, correlation_matrix
+- utils.price_index: PriceIndex build, window_returns, monthly_returns
+- utils.indicators: compute_indicators
+- utils.correlation: rolling_corr_vs
+
+Each computation is timed --repeat times (latency p50 / p90 / max) and
+then run once more under tracemalloc for its peak allocation. Results
+are written as JSON, like benchmarks/etl_benchmark.py.
+
+Usage (from the project root):
+    python benchmarks/analytics_benchmark.py [--scales 50x250 500x250 5000x250] [--repeat 5]
+"""
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.etl_benchmark import RESULTS_DIR, parse_scale
+from etl.derive import Deriver
+from utils import analytics
+from utils.correlation import rolling_corr_vs
+from utils.data_loader import prepare_frame
+from utils.indicators import compute_indicators
+from utils.price_index import PriceIndex
+
+DEFAULT_SCALES = ["50x250", "500x250", "5000x250", "500x1000"]
+SECTORS = ["Banking", "IT", "Energy", "FMCG", "Pharma", "Auto", "Metals", "Telecom"]
+
+
+def synthetic_frame(n_tickers, n_days, derived=True, seed=0):
+    """
+    Long-format frame shaped like the ETL output (seeded random walks).
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=n_days) + pd.Timedelta(hours=5, minutes=30)
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+
+    start = rng.uniform(50, 5000, size=(n_tickers, 1))
+    close = start * np.cumprod(1 + rng.normal(0, 0.015, size=(n_tickers, n_days)), axis=1)
+    open_ = close * (1 + rng.normal(0, 0.005, size=close.shape))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, size=close.shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, size=close.shape)))
+
+    df = pd.DataFrame({
+        "Ticker": np.repeat(tickers, n_days),
+        "date": np.tile(dates, n_tickers),
+        "month": np.tile(dates.strftime("%Y-%m"), n_tickers),
+        "open": open_.ravel().round(2),
+        "high": high.ravel().round(2),
+        "low": low.ravel().round(2),
+        "close": close.ravel().round(2),
+        "volume": rng.lognormal(13, 1, size=close.size).astype("int64"),
+    })
+
+    if derived:
+        df = Deriver(".").derive(df)
+
+    return prepare_frame(df)
+
+
+def sector_map_for(df):
+    tickers = df["Ticker"].astype(str).unique()
+    return pd.DataFrame({
+        "ticker": tickers,
+        "sector": [SECTORS[i % len(SECTORS)] for i in range(len(tickers))],
+    })
+
+
+def computations(df):
+    """
+    {name: zero-argument callable}; inputs of later steps are computed
+    once up front so each entry times only its own work.
+    """
+    sector_map = sector_map_for(df)
+    cumulative = analytics.cumulative_returns(df)
+    returns = analytics.returns_matrix(df)
+    index = PriceIndex(df)
+    first_ticker, benchmark = returns.columns[0], returns.columns[1]
+
+    return {
+        "yearly_returns": lambda: analytics.yearly_returns(df),
+        "volatility": lambda: analytics.volatility(df),
+        "cumulative_returns": lambda: analytics.cumulative_returns(df),
+        "top_cumulative": lambda: analytics.top_cumulative(cumulative),
+        "sector_performance": lambda: analytics.sector_performance(df, sector_map),
+        "returns_matrix": lambda: analytics.returns_matrix(df),
+        "correlation_matrix": lambda: analytics.correlation_matrix(returns),
+        "price_index_build": lambda: PriceIndex(df),
+        "window_returns": lambda: index.window_returns(),
+        "monthly_returns": lambda: index.monthly_returns(),
+        "compute_indicators": lambda: compute_indicators(df),
+        "rolling_corr_vs": lambda: rolling_corr_vs(returns, first_ticker, benchmark, 30),
+    }
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = np.array(timings) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p90_ms": round(float(np.percentile(timings, 90)), 3),
+        "max_ms": round(float(timings.max()), 3),
+        "peak_alloc_mb": round(peak / 1024 ** 2, 2),
+    }
+
+
+def benchmark_scale(n_tickers, n_days, repeat, derived=True, only=None):
+    df = synthetic_frame(n_tickers, n_days, derived)
+    results = {}
+
+    for name, func in computations(df).items():
+        if only and name not in only:
+            continue
+        results[name] = measure(func, repeat)
+        stats = results[name]
+        print(f"  {name:<22} p50 {stats['p50_ms']:10.2f} ms   p90 {stats['p90_ms']:10.2f} ms"
+              f"   max {stats['max_ms']:10.2f} ms   peak {stats['peak_alloc_mb']:8.2f} MB")
+
+    return {
+        "tickers": n_tickers,
+        "days": n_days,
+        "rows": len(df),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 1024 ** 2, 2),
+        "computations": results,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES,
+                            help="TICKERSxDAYS, e.g. 5000x250")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs per computation")
+    arg_parser.add_argument("--raw", action="store_true",
+                            help="frames without the ETL's derived return columns")
+    arg_parser.add_argument("--only", nargs="+", help="run only these computations")
+    arg_parser.add_argument("--output", help="result JSON path (default: benchmarks/results/analytics_<timestamp>.json)")
+    args = arg_parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        n_tickers, n_days = parse_scale(scale)
+        print(f"\n{n_tickers} tickers x {n_days} days")
+        results.append(benchmark_scale(n_tickers, n_days, args.repeat, not args.raw, args.only))
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "derived_columns": not args.raw,
+        "repeat": args.repeat,
+        "scales": results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written: {output}")
+
+
+if __name__ == "__main__":
+    main()
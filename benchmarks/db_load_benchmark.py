@@ -0,0 +1,97 @@
+"""
+Local benchmark for database/db_loader.py on SQLite (no server needed).
+
+Compares, on the combined ETL output (optionally replicated under
+synthetic tickers to make it larger):
+- pandas to_sql(if_exists="append", chunksize=5000)   (old loader)
+- load_stock_prices() bulk upsert                     (first load)
+- load_stock_prices() re-run                          (high-water mark → no-op)
+- load_stock_prices(full=True)                        (full idempotent upsert)
+
+and checks the upserted table never holds duplicate (ticker, trade_date) keys.
+
+Usage (from the project root, after the ETL has run):
+    python benchmarks/db_load_benchmark.py [--scale 10]
+"""
+import sys
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+# Add project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from database import db_loader
+
+
+def scaled_source(scale):
+    df = db_loader.read_source_rows()
+    if scale <= 1:
+        return df
+    copies = [df.assign(ticker=df["ticker"] + f"_{i}") for i in range(scale)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed:8.3f}s")
+    return result
+
+
+def count_rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT ticker || trade_date) FROM {db_loader.TABLE}"
+        ).fetchone()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--scale", type=int, default=1, help="replicate the dataset N times")
+    args = arg_parser.parse_args()
+
+    source = scaled_source(args.scale)
+    print(f"Rows: {len(source):,}\n")
+
+    # The loader reads its source through read_source_rows; serve the scaled frame
+    db_loader.read_source_rows = lambda since=None: (
+        source if since is None else source[pd.to_datetime(source["trade_date"]) > since]
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_db = os.path.join(tmp, "append.db")
+        new_db = os.path.join(tmp, "upsert.db")
+
+        old_engine = create_engine(f"sqlite:///{old_db}")
+        timed("to_sql append (old loader)", lambda: source.to_sql(
+            db_loader.TABLE, old_engine, if_exists="append", index=False, chunksize=5000
+        ))
+        timed("to_sql append, second run", lambda: source.to_sql(
+            db_loader.TABLE, old_engine, if_exists="append", index=False, chunksize=5000
+        ))
+        print(f"{'  → rows / distinct keys':<34} {count_rows(old_db)}\n")
+
+        engine = db_loader.get_engine(f"sqlite:///{new_db}")
+        timed("bulk upsert, first load", lambda: db_loader.load_stock_prices(engine))
+        sent = timed("bulk upsert, re-run", lambda: db_loader.load_stock_prices(engine))
+        print(f"{'  → rows sent on re-run':<34} {sent}")
+        timed("bulk upsert, --full", lambda: db_loader.load_stock_prices(engine, full=True))
+
+        rows, distinct = count_rows(new_db)
+        print(f"{'  → rows / distinct keys':<34} {(rows, distinct)}")
+
+        if rows != distinct or rows != len(source):
+            print("FAIL: upserted table does not match the source keys")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
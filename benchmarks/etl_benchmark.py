@@ -0,0 +1,223 @@
+"""
+Synthetic-scale throughput benchmark for the ETL stages.
+
+For each scale (N tickers x M days) a synthetic snapshot folder is written
+(see synthetic_snapshots.py) and every stage is timed separately:
+- extract.get_all_yaml_files
+- extract.process_yaml_file                (all files)
+- Transformer.normalize + is_valid         (row-at-a-time path)
+- Transformer.normalize_batch              (columnar path used by run_etl)
+- Loader.write_symbol_csv + close
+- Loader.write_combined_csv / write_combined_parquet / write_monthly_reports
+
+Each scale runs in a fresh process, so the reported peak RSS belongs to
+that scale alone (rss_after_mb is the process high-water mark once the
+stage has finished; None on Windows, which has no getrusage). Results
+are written as JSON; pass --compare with an earlier result file to print
+the rows/s change per stage.
+
+Usage (from the project root):
+    python benchmarks/etl_benchmark.py [--scales 50x60 500x250] [--output FILE] [--compare OLD.json]
+"""
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+# Add project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.synthetic_snapshots import write_snapshots
+from etl import extract
+from etl.transform import Transformer
+from etl.load import Loader
+from etl.metrics import peak_rss_mb
+
+DEFAULT_SCALES = ["50x60", "500x60", "500x250"]
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+
+def parse_scale(text):
+    tickers, days = text.lower().split("x")
+    return int(tickers), int(days)
+
+
+class StageTimer:
+    """
+    Collects {stage: seconds, rows, rows_per_s, rss_after_mb}; `rows` is
+    the number of snapshot rows the stage covered.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def run(self, name, rows, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+
+        self.stages[name] = {
+            "seconds": round(elapsed, 4),
+            "rows": rows,
+            "rows_per_s": round(rows / elapsed, 1) if elapsed > 0 else None,
+            "rss_after_mb": peak_rss_mb(),
+        }
+        return result
+
+
+def benchmark_scale(n_tickers, n_days):
+    """
+    Generate one synthetic dataset and time every stage on it.
+    Runs in a worker process (see main).
+    """
+    timer = StageTimer()
+    transformer = Transformer()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = os.path.join(tmp, "data")
+        generated = write_snapshots(raw_dir, n_tickers, n_days)
+        rows = generated["rows"]
+
+        # ---------------------------------------------------------
+        # 1. EXTRACT
+        # ---------------------------------------------------------
+        extract.RAW_DIR = raw_dir
+        files = timer.run("get_all_yaml_files", rows, extract.get_all_yaml_files)
+
+        entries_by_file = timer.run(
+            "process_yaml_file", rows,
+            lambda: [extract.process_yaml_file(file) for file in files]
+        )
+
+        # ---------------------------------------------------------
+        # 2. TRANSFORM
+        # ---------------------------------------------------------
+        def normalize_rows():
+            kept = 0
+            for entries in entries_by_file:
+                for entry in entries:
+                    kept += transformer.is_valid(transformer.normalize(entry))
+            return kept
+
+        timer.run("normalize+is_valid", rows, normalize_rows)
+
+        batches = timer.run(
+            "normalize_batch", rows,
+            lambda: [transformer.normalize_batch(entries) for entries in entries_by_file]
+        )
+        del entries_by_file
+
+        valid = [
+            row for batch in batches
+            for row, is_valid in zip(batch.to_rows(), batch.valid) if is_valid
+        ]
+        rejected = rows - len(valid)
+        del batches
+
+        # ---------------------------------------------------------
+        # 3. LOAD
+        # ---------------------------------------------------------
+        loader = Loader(
+            output_csv_dir=os.path.join(tmp, "output_csv"),
+            output_combined_dir=os.path.join(tmp, "output_combined"),
+            output_reports_dir=os.path.join(tmp, "output_reports")
+        )
+
+        def write_symbols():
+            for row in valid:
+                loader.write_symbol_csv(row)
+            loader.close()
+
+        timer.run("write_symbol_csv", len(valid), write_symbols)
+        timer.run("write_combined_csv", len(valid), loader.write_combined_csv)
+        timer.run("write_combined_parquet", len(valid), loader.write_combined_parquet)
+        timer.run("write_monthly_reports", len(valid), loader.write_monthly_reports)
+
+    return {
+        "tickers": n_tickers,
+        "days": n_days,
+        "rows": rows,
+        "rows_rejected": rejected,
+        "malformed": generated["malformed"],
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.stages,
+    }
+
+
+def print_scale(result):
+    print(f"\n{result['tickers']} tickers x {result['days']} days "
+          f"({result['rows']:,} rows, {result['rows_rejected']} rejected, "
+          f"peak RSS {result['peak_rss_mb']} MB)")
+    for name, stage in result["stages"].items():
+        rate = f"{stage['rows_per_s']:>12,.0f} rows/s" if stage["rows_per_s"] else ""
+        print(f"  {name:<24} {stage['seconds']:8.3f}s {rate}  rss {stage['rss_after_mb']} MB")
+
+
+def compare(results, baseline_path):
+    """
+    rows/s change per (scale, stage) against an earlier result file.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    previous = {(r["tickers"], r["days"]): r["stages"] for r in baseline["scales"]}
+    print(f"\nChange vs {baseline_path} (rows/s, + is faster)")
+
+    for result in results:
+        old_stages = previous.get((result["tickers"], result["days"]))
+        if old_stages is None:
+            continue
+        for name, stage in result["stages"].items():
+            old = old_stages.get(name, {}).get("rows_per_s")
+            if old and stage["rows_per_s"]:
+                change = (stage["rows_per_s"] / old - 1) * 100
+                print(f"  {result['tickers']}x{result['days']:<6} {name:<24} {change:+7.1f}%")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES,
+                            help="TICKERSxDAYS, e.g. 500x250")
+    arg_parser.add_argument("--output", help="result JSON path (default: benchmarks/results/etl_<timestamp>.json)")
+    arg_parser.add_argument("--compare", help="earlier result JSON to compare rows/s against")
+    args = arg_parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        n_tickers, n_days = parse_scale(scale)
+
+        # Fresh process per scale: clean peak RSS, no state carried over
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(benchmark_scale, n_tickers, n_days).result()
+
+        print_scale(result)
+        results.append(result)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"etl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
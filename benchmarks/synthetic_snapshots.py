@@ -0,0 +1,149 @@
+"""
+Synthetic daily YAML snapshots in the same layout as the real data folder:
+
+    <out_dir>/2024-10/2024-10-01_05-30-00.yaml
+
+one file per trading day (weekdays), one row per ticker, prices following
+a seeded random walk. A small fraction of rows is deliberately malformed
+so the validation / slow cleaning paths are exercised too:
+- missing close, empty Ticker or an unparseable date   (rejected rows)
+- numbers written as quoted strings with Indian digit grouping, e.g.
+  '1,32,80,535'                                         (kept, slow path)
+
+Usage (from the project root):
+    python benchmarks/synthetic_snapshots.py OUT_DIR [--tickers 500] [--days 250]
+"""
+import os
+import argparse
+import random
+from datetime import date, timedelta
+
+SNAPSHOT_TIME = "05:30:00"
+
+# Share of rows written with each kind of defect
+MALFORMED_RATES = {
+    "missing_close": 0.002,
+    "empty_ticker": 0.001,
+    "bad_date": 0.001,
+    "grouped_number": 0.005,
+}
+
+
+def ticker_names(count):
+    """
+    SYN0000, SYN0001, ... (stable, sortable, valid snapshot words).
+    """
+    return [f"SYN{i:04d}" for i in range(count)]
+
+
+def trading_days(count, start=date(2023, 10, 2)):
+    days = []
+    day = start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def indian_grouping(number):
+    """
+    1328053 -> '13,28,053' (the comma style clean_number() strips).
+    """
+    digits = str(number)
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    return ",".join(groups + [tail])
+
+
+def snapshot_lines(tickers, day, prices, rng):
+    """
+    Lines of one day's snapshot; advances `prices` (ticker -> last close).
+    """
+    date_text = f"'{day.isoformat()} {SNAPSHOT_TIME}'"
+    month = day.strftime("%Y-%m")
+    lines = []
+    counts = dict.fromkeys(MALFORMED_RATES, 0)
+
+    for ticker in tickers:
+        previous = prices[ticker]
+        open_ = round(previous * (1 + rng.gauss(0, 0.005)), 2)
+        close = round(previous * (1 + rng.gauss(0, 0.015)), 2)
+        high = round(max(open_, close) * (1 + abs(rng.gauss(0, 0.005))), 2)
+        low = round(min(open_, close) * (1 - abs(rng.gauss(0, 0.005))), 2)
+        volume = int(rng.lognormvariate(13, 1))
+        prices[ticker] = close
+
+        fields = {
+            "Ticker": ticker, "close": close, "date": date_text, "high": high,
+            "low": low, "month": month, "open": open_, "volume": volume,
+        }
+
+        defect = rng.random()
+        for kind, rate in MALFORMED_RATES.items():
+            if defect < rate:
+                counts[kind] += 1
+                if kind == "missing_close":
+                    fields["close"] = ""
+                elif kind == "empty_ticker":
+                    fields["Ticker"] = ""
+                elif kind == "bad_date":
+                    fields["date"] = "'not a date'"
+                else:
+                    fields["volume"] = f"'{indian_grouping(volume)}'"
+                break
+            defect -= rate
+
+        first = True
+        for key, value in fields.items():
+            value = str(value)
+            prefix = "- " if first else "  "
+            lines.append(f"{prefix}{key}: {value}" if value else f"{prefix}{key}:")
+            first = False
+
+    return lines, counts
+
+
+def write_snapshots(out_dir, n_tickers, n_days, seed=0):
+    """
+    Write n_days snapshot files of n_tickers rows each under out_dir.
+    Returns {"files", "rows", "malformed": {kind: count}}.
+    """
+    rng = random.Random(seed)
+    tickers = ticker_names(n_tickers)
+    prices = {ticker: rng.uniform(50, 5000) for ticker in tickers}
+    malformed = dict.fromkeys(MALFORMED_RATES, 0)
+
+    for day in trading_days(n_days):
+        month_dir = os.path.join(out_dir, day.strftime("%Y-%m"))
+        os.makedirs(month_dir, exist_ok=True)
+
+        lines, counts = snapshot_lines(tickers, day, prices, rng)
+        for kind, count in counts.items():
+            malformed[kind] += count
+
+        file_name = f"{day.isoformat()}_{SNAPSHOT_TIME.replace(':', '-')}.yaml"
+        with open(os.path.join(month_dir, file_name), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    return {"files": n_days, "rows": n_tickers * n_days, "malformed": malformed}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Write synthetic daily YAML snapshots")
+    arg_parser.add_argument("out_dir")
+    arg_parser.add_argument("--tickers", type=int, default=500)
+    arg_parser.add_argument("--days", type=int, default=250)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    summary = write_snapshots(args.out_dir, args.tickers, args.days, args.seed)
+    print(f"Wrote {summary['files']} files / {summary['rows']:,} rows to {args.out_dir}")
+    print(f"Malformed rows: {summary['malformed']}")
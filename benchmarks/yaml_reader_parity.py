@@ -0,0 +1,158 @@
+"""
+Parity + timing check for the fast YAML reader in etl/extract.py.
+
+Every snapshot under the raw data folder is loaded with:
+- yaml.safe_load          (pure-Python reference)
+- yaml C loader           (libyaml, when available)
+- etl.extract.load_yaml   (line parser with loader fallback)
+
+The script fails if any reader returns something different from
+safe_load, then prints a per-file timing comparison.
+
+Usage:
+    python benchmarks/yaml_reader_parity.py [--data-dir daata] [--repeat 5] [--per-file]
+"""
+import sys
+import os
+import time
+import argparse
+import statistics
+
+import yaml
+
+# Add project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from etl import extract
+from etl.extract import YamlLoader, load_yaml, parse_snapshot_lines, UnexpectedSnapshotFormat
+
+
+def safe_load_file(file_path):
+    with open(file_path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def c_load_file(file_path):
+    with open(file_path, "r") as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+READERS = {
+    "safe_load": safe_load_file,
+    "c_loader": c_load_file,
+    "fast_reader": load_yaml,
+}
+
+
+def uses_fast_path(file_path):
+    with open(file_path, "r") as f:
+        try:
+            parse_snapshot_lines(f.read().splitlines())
+            return True
+        except UnexpectedSnapshotFormat:
+            return False
+
+
+def value_types(data):
+    """
+    Type signature of a loaded document, so 1 vs 1.0 vs "1" count as different.
+    """
+    if isinstance(data, list):
+        return [value_types(item) for item in data]
+    if isinstance(data, dict):
+        return {key: value_types(value) for key, value in data.items()}
+    return type(data).__name__
+
+
+def check_parity(files):
+    """
+    Compare every reader against safe_load, including value types.
+    Returns the list of mismatching (reader, file) pairs.
+    """
+    mismatches = []
+
+    for file_path in files:
+        expected = safe_load_file(file_path)
+
+        for name, reader in READERS.items():
+            result = reader(file_path)
+
+            if result != expected or value_types(result) != value_types(expected):
+                mismatches.append((name, file_path))
+
+    return mismatches
+
+
+def time_readers(files, repeat):
+    """
+    Best-of-`repeat` wall time (seconds) per reader per file.
+    """
+    timings = {name: {} for name in READERS}
+
+    for file_path in files:
+        for name, reader in READERS.items():
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                reader(file_path)
+                best = min(best, time.perf_counter() - started)
+            timings[name][file_path] = best
+
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--data-dir", default=os.path.join(PROJECT_ROOT, "daata"))
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--per-file", action="store_true", help="print one timing line per file")
+    args = arg_parser.parse_args()
+
+    extract.RAW_DIR = args.data_dir
+    files = extract.get_all_yaml_files()
+
+    if not files:
+        print(f"No YAML files found under {args.data_dir}")
+        sys.exit(1)
+
+    # ---------------------------------------------------------
+    # 1. PARITY
+    # ---------------------------------------------------------
+    mismatches = check_parity(files)
+    fast_files = sum(uses_fast_path(f) for f in files)
+
+    print(f"Files checked: {len(files)} (line parser used for {fast_files}, "
+          f"loader fallback for {len(files) - fast_files})")
+    print(f"C loader available: {YamlLoader.__name__ == 'CSafeLoader'}")
+
+    if mismatches:
+        for name, file_path in mismatches:
+            print(f"MISMATCH [{name}] {file_path}")
+        sys.exit(1)
+
+    print("Parity: OK (all readers match yaml.safe_load)\n")
+
+    # ---------------------------------------------------------
+    # 2. PER-FILE TIMING
+    # ---------------------------------------------------------
+    timings = time_readers(files, args.repeat)
+
+    if args.per_file:
+        print(f"{'file':<45}" + "".join(f"{name:>14}" for name in READERS))
+        for file_path in files:
+            cells = "".join(f"{timings[name][file_path] * 1000:>12.3f}ms" for name in READERS)
+            print(f"{os.path.relpath(file_path, args.data_dir):<45}{cells}")
+        print()
+
+    baseline = statistics.median(timings["safe_load"].values())
+
+    print(f"{'reader':<14}{'median/file':>14}{'total':>12}{'speedup':>10}")
+    for name in READERS:
+        per_file = timings[name].values()
+        median = statistics.median(per_file)
+        print(f"{name:<14}{median * 1000:>12.3f}ms{sum(per_file):>11.3f}s{baseline / median:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,248 @@
-from sqlalchemy import create_engine
+import os
+import re
+import sys
 import pandas as pd
+from sqlalchemy import bindparam, create_engine, text
 
-# Create MySQL engine
-engine = create_engine("mysql+pymysql://root:@localhost/stock_analysis")
+# Add project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
 
-def load_data(query="SELECT * FROM stock_prices"):
+from utils.memo import LRUCache
+
+# ----------------------------------------------------
+# Engine settings (environment overrides)
+# ----------------------------------------------------
+DB_URL = os.environ.get("STOCK_DB_URL", "mysql+pymysql://root:@localhost/stock_analysis")
+POOL_SIZE = int(os.environ.get("STOCK_DB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.environ.get("STOCK_DB_MAX_OVERFLOW", 10))
+POOL_RECYCLE = int(os.environ.get("STOCK_DB_POOL_RECYCLE", 1800))   # seconds
+
+# Query result cache: entries expire after QUERY_CACHE_TTL seconds and the
+# least recently used are evicted beyond QUERY_CACHE_SIZE
+QUERY_CACHE_TTL = float(os.environ.get("STOCK_DB_CACHE_TTL", 300))
+QUERY_CACHE_SIZE = int(os.environ.get("STOCK_DB_CACHE_SIZE", 128))
+
+
+def create_db_engine(db_url=DB_URL, **kwargs):
+    """
+    Pooled engine: pre-ping drops dead connections before use and
+    recycling avoids server-side idle timeouts.
+    """
+    options = {"pool_pre_ping": True, "pool_recycle": POOL_RECYCLE}
+
+    # In-memory SQLite uses a single-connection pool without size settings
+    if not (db_url.startswith("sqlite") and ":memory:" in db_url):
+        options.update(pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
+
+    options.update(kwargs)
+    return create_engine(db_url, **options)
+
+
+# Module-level engine (connections are only opened on first use)
+engine = create_db_engine()
+
+query_cache = LRUCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+
+
+# ---------------------------------------------------------
+# 1. QUERY CACHE
+# ---------------------------------------------------------
+def normalize_sql(sql):
+    """
+    Collapse whitespace and drop a trailing semicolon, so formatting
+    differences do not defeat the cache.
+    """
+    return re.sub(r"\s+", " ", sql).strip().rstrip(";").strip()
+
+
+def engine_key(db_engine):
+    """
+    Identifies the database an engine reads: engines on the same URL share
+    cached results, while in-memory SQLite databases are private to their
+    engine.
+    """
+    url = db_engine.url
+    key = url.render_as_string(hide_password=True)
+
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        key = f"{key}#{id(db_engine)}"
+    return key
+
+
+def cache_key(sql, params=None, db_engine=None):
+    frozen = tuple(sorted(
+        (name, tuple(value) if isinstance(value, (list, tuple, set)) else value)
+        for name, value in (params or {}).items()
+    ))
+    return engine_key(db_engine or engine), normalize_sql(sql), frozen
+
+
+def invalidate_cache(table=None, db_engine=None):
+    """
+    Drop cached results of queries reading `table` (all tables if None)
+    from the database of `db_engine` (all databases if None).
+    Called by the loader once a load into stock_prices has committed.
+    """
+    if table is None and db_engine is None:
+        count = len(query_cache)
+        query_cache.clear()
+        return count
+
+    database = None if db_engine is None else engine_key(db_engine)
+    pattern = None if table is None else re.compile(rf"\b{re.escape(table)}\b", re.IGNORECASE)
+
+    return query_cache.invalidate(lambda key: (
+        (database is None or key[0] == database) and
+        (pattern is None or bool(pattern.search(key[1])))
+    ))
+
+
+# ---------------------------------------------------------
+# 2. PARAMETERIZED QUERIES
+# ---------------------------------------------------------
+def query(sql, params=None, use_cache=True, db_engine=None):
+    """
+    Run `sql` with bound `params` (":name" placeholders; list / tuple
+    values expand for IN clauses) and return a DataFrame.
+    Cached results are copies, so callers may modify them freely.
+    """
+    statement = text(sql)
+    params = dict(params or {})
+
+    for name, value in params.items():
+        if isinstance(value, (list, tuple, set)):
+            statement = statement.bindparams(bindparam(name, expanding=True))
+            params[name] = list(value)
+
+    def run():
+        with (db_engine or engine).connect() as conn:
+            return pd.read_sql(statement, conn, params=params)
+
+    if not use_cache:
+        return run()
+
+    return query_cache.get_or_compute(cache_key(sql, params, db_engine), run).copy()
+
+
+def query_prices(tickers=None, start_date=None, end_date=None, columns=None, **kwargs):
+    """
+    Rows of stock_prices for the given tickers / inclusive date range,
+    ordered by ticker, trade_date.
+    """
+    columns = ", ".join(columns) if columns else "*"
+    conditions, params = [], {}
+
+    if tickers:
+        conditions.append("ticker IN :tickers")
+        params["tickers"] = sorted(tickers)
+    if start_date is not None:
+        conditions.append("trade_date >= :start_date")
+        params["start_date"] = str(pd.Timestamp(start_date))
+    if end_date is not None:
+        conditions.append("trade_date <= :end_date")
+        params["end_date"] = str(pd.Timestamp(end_date))
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return query(
+        f"SELECT {columns} FROM stock_prices{where} ORDER BY ticker, trade_date",
+        params, **kwargs
+    )
+
+
+# load_data's `query` argument (its original name) shadows the function
+_run_query = query
+
+
+def load_data(query="SELECT * FROM stock_prices", params=None):
+    """
+    Returns a DataFrame from the database given a query.
+    """
+    return _run_query(query, params)
+
+
+# ---------------------------------------------------------
+# 3. STREAMING READS (BOUNDED MEMORY)
+# ---------------------------------------------------------
+DEFAULT_CHUNK_SIZE = int(os.environ.get("STOCK_DB_CHUNK_SIZE", 50000))
+
+
+def stream_query(sql, params=None, chunksize=DEFAULT_CHUNK_SIZE, db_engine=None):
+    """
+    Yield the result of `sql` as DataFrames of at most `chunksize` rows.
+
+    Uses a server-side cursor (stream_results), so only one chunk is held
+    in memory at a time; never cached. Stop iterating early to cancel.
+    """
+    statement = text(sql)
+    params = dict(params or {})
+
+    for name, value in params.items():
+        if isinstance(value, (list, tuple, set)):
+            statement = statement.bindparams(bindparam(name, expanding=True))
+            params[name] = list(value)
+
+    with (db_engine or engine).connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+        yield from pd.read_sql(statement, conn, params=params, chunksize=chunksize)
+
+
+AGGREGATIONS = {"sum", "count", "min", "max", "mean", "size"}
+
+
+def aggregate_chunks(chunks, by, aggregations):
+    """
+    Group-by aggregation over an iterable of DataFrame chunks in bounded
+    memory: each chunk is reduced to per-group partials which are folded
+    into a running result (mean = sum / count at the end).
+
+    aggregations: {output_column: (input_column, "sum" | "count" | "min"
+                   | "max" | "mean" | "size")}
+    """
+    by = [by] if isinstance(by, str) else list(by)
+
+    unknown = {how for _, how in aggregations.values()} - AGGREGATIONS
+    if unknown:
+        raise ValueError(f"Unsupported aggregation(s): {sorted(unknown)}")
+
+    # Partials that can be combined across chunks
+    partial_specs = {}
+    for name, (column, how) in aggregations.items():
+        if how == "mean":
+            partial_specs[f"{name}__sum"] = (column, "sum")
+            partial_specs[f"{name}__count"] = (column, "count")
+        elif how == "size":
+            partial_specs[name] = (by[0], "size")
+        else:
+            partial_specs[name] = (column, how)
+
+    combine = {
+        name: ("sum" if how in ("sum", "count", "size") else how)
+        for name, (_, how) in partial_specs.items()
+    }
+
+    result = None
+    for chunk in chunks:
+        partial = chunk.groupby(by, sort=False).agg(**partial_specs)
+
+        if result is None:
+            result = partial
+        else:
+            result = pd.concat([result, partial]).groupby(level=by, sort=False).agg(combine)
+
+    if result is None:
+        return pd.DataFrame(columns=by + list(aggregations))
+
+    for name, (_, how) in aggregations.items():
+        if how == "mean":
+            result[name] = result.pop(f"{name}__sum") / result.pop(f"{name}__count")
+
+    return result[list(aggregations)].sort_index().reset_index()
+
+
+def aggregate_query(sql, by, aggregations, params=None, chunksize=DEFAULT_CHUNK_SIZE):
     """
-    Returns a DataFrame from MySQL given a query.
+    stream_query + aggregate_chunks: aggregate a large result set
+    without ever materializing it.
     """
-    return pd.read_sql(query, engine)
+    return aggregate_chunks(stream_query(sql, params, chunksize), by, aggregations)
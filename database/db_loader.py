@@ -1,16 +1,246 @@
-import pandas as pd
-from sqlalchemy import create_engine
+import sys
 import os
+import csv
+import time
+import argparse
+import tempfile
+import pandas as pd
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+# Add project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from etl.load import read_combined_parquet
+from etl.transform import DATE_FORMAT
+from database.connect_db import DB_URL, create_db_engine, invalidate_cache
+
+# ----------------------------------------------------
+# Idempotent bulk loader for the stock_prices table
+# - Upsert keyed on (ticker, trade_date): re-runs never duplicate rows
+# - Only rows newer than the table's high-water mark are sent
+#   (--full re-sends everything, e.g. after corrected snapshots)
+# - MySQL: LOAD DATA LOCAL INFILE into a staging table, then one
+#   INSERT ... ON DUPLICATE KEY UPDATE
+# - SQLite: executemany INSERT ... ON CONFLICT DO UPDATE
+#   (local stand-in for tests / benchmarks, no server needed)
+# ----------------------------------------------------
+
+TABLE = "stock_prices"
+KEY_COLUMNS = ["ticker", "trade_date"]
+COLUMNS = ["ticker", "trade_date", "month", "open", "high", "low", "close", "volume"]
+VALUE_COLUMNS = [c for c in COLUMNS if c not in KEY_COLUMNS]
+
+CSV_PATH = "output_combined/all_data.csv"
+PARQUET_DIR = "output_combined/all_data_parquet"
+
+CREATE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {{table}} (
+    ticker VARCHAR(32) NOT NULL,
+    trade_date DATETIME NOT NULL,
+    month VARCHAR(7),
+    open DOUBLE,
+    high DOUBLE,
+    low DOUBLE,
+    close DOUBLE,
+    volume BIGINT,
+    PRIMARY KEY ({", ".join(KEY_COLUMNS)})
+)
+"""
+
+
+def get_engine(db_url=DB_URL):
+    if db_url.startswith("mysql"):
+        # LOAD DATA LOCAL INFILE must be allowed on the client side
+        return create_db_engine(db_url, connect_args={"local_infile": True})
+    return create_db_engine(db_url)
+
+
+# ---------------------------------------------------------
+# 1. SOURCE ROWS
+# ---------------------------------------------------------
+def read_source_rows(since=None):
+    """
+    Combined ETL output (Parquet when available, otherwise the CSV)
+    in the stock_prices column layout, optionally only rows after `since`.
+    """
+    if os.path.isdir(PARQUET_DIR):
+        df = read_combined_parquet(PARQUET_DIR)
+    else:
+        df = pd.read_csv(CSV_PATH)
+        df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT)
+
+    df = df.rename(columns={"date": "trade_date", "Ticker": "ticker"})
+
+    if since is not None:
+        df = df[df["trade_date"] > pd.Timestamp(since)]
+
+    df = df.sort_values(KEY_COLUMNS, kind="stable")
+    df["month"] = df["trade_date"].dt.strftime("%Y-%m")
+    df["trade_date"] = df["trade_date"].dt.strftime(DATE_FORMAT)
+
+    return df[COLUMNS]
+
+
+def to_records(df):
+    """
+    Plain Python tuples for the DBAPI (None for missing values).
+    """
+    df = df.astype(object).where(df.notna(), None)
+    return list(df.itertuples(index=False, name=None))
+
+
+# ---------------------------------------------------------
+# 2. SCHEMA + HIGH-WATER MARK
+# ---------------------------------------------------------
+def ensure_table(conn):
+    """
+    Create stock_prices with its (ticker, trade_date) key. A table left by
+    the old append-only loader has no key (and possibly duplicates): it is
+    rebuilt once, keeping one row per key.
+    """
+    inspector = inspect(conn)
+
+    if not inspector.has_table(TABLE):
+        conn.execute(text(CREATE_TABLE_SQL.format(table=TABLE)))
+        return
+
+    if has_unique_key(inspector):
+        return
+
+    print(f"Adding ({', '.join(KEY_COLUMNS)}) key to existing {TABLE} table...")
+    keyed = f"{TABLE}_keyed"
+    insert_ignore = "INSERT OR IGNORE" if conn.dialect.name == "sqlite" else "INSERT IGNORE"
+    column_list = ", ".join(COLUMNS)
+
+    conn.execute(text(f"DROP TABLE IF EXISTS {keyed}"))
+    conn.execute(text(CREATE_TABLE_SQL.format(table=keyed)))
+    conn.execute(text(f"{insert_ignore} INTO {keyed} ({column_list}) SELECT {column_list} FROM {TABLE}"))
+    conn.execute(text(f"DROP TABLE {TABLE}"))
+    conn.execute(text(f"ALTER TABLE {keyed} RENAME TO {TABLE}"))
+
+
+def has_unique_key(inspector):
+    if inspector.get_pk_constraint(TABLE).get("constrained_columns") == KEY_COLUMNS:
+        return True
+
+    unique = [u["column_names"] for u in inspector.get_unique_constraints(TABLE)]
+    unique += [i["column_names"] for i in inspector.get_indexes(TABLE) if i.get("unique")]
+    return KEY_COLUMNS in unique
+
+
+def high_water_mark(conn):
+    """
+    Latest trade_date already loaded (None for an empty table).
+    """
+    latest = conn.execute(text(f"SELECT MAX(trade_date) FROM {TABLE}")).scalar()
+    return None if latest is None else pd.Timestamp(latest)
+
+
+# ---------------------------------------------------------
+# 3. BULK UPSERT
+# ---------------------------------------------------------
+def upsert_sqlite(conn, df):
+    updates = ", ".join(f"{c} = excluded.{c}" for c in VALUE_COLUMNS)
+    sql = (
+        f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in COLUMNS)}) "
+        f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates}"
+    )
+    conn.connection.cursor().executemany(sql, to_records(df))
+
+
+def upsert_mysql(conn, df):
+    """
+    LOAD DATA into a temporary staging table, then a single set-based
+    upsert. Falls back to batched multi-row INSERT ... ON DUPLICATE KEY
+    UPDATE when the server refuses LOCAL INFILE.
+    """
+    updates = ", ".join(f"{c} = VALUES({c})" for c in VALUE_COLUMNS)
+    column_list = ", ".join(COLUMNS)
+
+    conn.execute(text(f"CREATE TEMPORARY TABLE {TABLE}_staging LIKE {TABLE}"))
+
+    # Line endings must match LINES TERMINATED BY below on every platform
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", delete=False) as f:
+        df.to_csv(f, index=False, header=False, na_rep="\\N", quoting=csv.QUOTE_MINIMAL,
+                  lineterminator="\n")
+        staging_file = f.name
+
+    try:
+        conn.execute(text(
+            f"LOAD DATA LOCAL INFILE :path INTO TABLE {TABLE}_staging "
+            f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            f"LINES TERMINATED BY '\\n' ({column_list})"
+        ), {"path": staging_file.replace("\\", "/")})
+
+    except (OperationalError, ProgrammingError) as e:
+        # local_infile disabled on the server or client; errors from the
+        # upsert itself are not caught and propagate
+        print(f"LOAD DATA unavailable ({e.orig}); using batched INSERT ... ON DUPLICATE KEY UPDATE")
+        conn.execute(text(f"DROP TEMPORARY TABLE {TABLE}_staging"))
+        sql = (
+            f"INSERT INTO {TABLE} ({column_list}) "
+            f"VALUES ({', '.join('%s' for _ in COLUMNS)}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+        conn.connection.cursor().executemany(sql, to_records(df))
+        return
+
+    finally:
+        os.remove(staging_file)
+
+    conn.execute(text(
+        f"INSERT INTO {TABLE} ({column_list}) "
+        f"SELECT {column_list} FROM {TABLE}_staging "
+        f"ON DUPLICATE KEY UPDATE {updates}"
+    ))
+    conn.execute(text(f"DROP TEMPORARY TABLE {TABLE}_staging"))
+
+
+def load_stock_prices(engine, full=False):
+    """
+    Upsert the ETL output into stock_prices; returns rows sent.
+    Running it twice in a row sends nothing the second time.
+    """
+    with engine.begin() as conn:
+        ensure_table(conn)
+
+        since = None if full else high_water_mark(conn)
+        df = read_source_rows(since)
+
+        if df.empty:
+            return 0
+
+        if conn.dialect.name == "sqlite":
+            upsert_sqlite(conn, df)
+        else:
+            upsert_mysql(conn, df)
 
-engine = create_engine("mysql+pymysql://root:@localhost/stock_analysis")
+    # Committed: cached query results over stock_prices are now stale
+    invalidate_cache(TABLE, engine)
 
-df = pd.read_csv("output_combined/all_data.csv")
+    return len(df)
 
-# FIX: rename column to match MySQL schema
-df = df.rename(columns={"date": "trade_date"})
 
-df["month"] = df["trade_date"].str[:7]
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Bulk-load ETL output into stock_prices")
+    arg_parser.add_argument(
+        "--db-url", default=DB_URL,
+        help="SQLAlchemy URL (default: $STOCK_DB_URL or local MySQL), e.g. sqlite:///stock_analysis.db"
+    )
+    arg_parser.add_argument(
+        "--full", action="store_true",
+        help="upsert every row instead of only rows after the high-water mark"
+    )
+    args = arg_parser.parse_args()
 
-df.to_sql("stock_prices", engine, if_exists="append", index=False, chunksize=5000)
+    started = time.perf_counter()
+    rows = load_stock_prices(get_engine(args.db_url), full=args.full)
+    elapsed = time.perf_counter() - started
 
-print("Data loaded into MySQL successfully")
+    if rows:
+        print(f"Upserted {rows} rows into {TABLE} in {elapsed:.2f}s")
+    else:
+        print(f"{TABLE} already up to date")
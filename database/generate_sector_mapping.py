@@ -6,13 +6,18 @@ import pandas as pd
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(PROJECT_ROOT)
 
-from database.connect_db import load_data
+from database.connect_db import stream_query
 
 # -------------------------------------------
 # Generate sector mapping from actual DB data
 # -------------------------------------------
 
-df = load_data("SELECT DISTINCT ticker FROM stock_prices")
+# Streamed in chunks, so the table size never matters here
+tickers = set()
+for chunk in stream_query("SELECT DISTINCT ticker FROM stock_prices"):
+    tickers.update(chunk["ticker"])
+
+df = pd.DataFrame({"ticker": sorted(tickers)})
 
 sector_map = {
     "SBIN": "BANKING",
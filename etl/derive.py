@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from etl.transform import DATE_FORMAT
+from etl.load import COMBINED_COLUMNS, COMBINED_PARQUET_DIR, pq, read_combined_parquet
+
+DERIVED_PARQUET = "derived_data.parquet"
+DERIVED_CSV = "derived_data.csv"
+
+DERIVED_COLUMNS = [
+    "daily_return",       # close / previous close - 1
+    "log_return",         # log(1 + daily_return)
+    "cumulative_return",  # compounded return since the ticker's first date
+    "return_mean",        # running mean of daily_return
+    "return_volatility",  # running std of daily_return
+    "running_max_close",  # highest close so far
+    "drawdown",           # close / running_max_close - 1
+]
+
+
+class Deriver:
+    """
+    Deriver is the ETL stage after the Loader. It reads the combined
+    dataset and materializes per-ticker analytics columns once, so the
+    dashboard does not recompute them on every rerun:
+    - Daily / log / cumulative returns
+    - Running mean + volatility of daily returns
+    - Running max close + drawdown
+
+    Output (sorted by Ticker, date): derived_data.parquet, or
+    derived_data.csv when pyarrow is not installed.
+    """
+
+    def __init__(self, output_combined_dir):
+        self.output_combined_dir = Path(output_combined_dir)
+
+    # ---------------------------------------------------------
+    # 1. READ COMBINED DATASET
+    # ---------------------------------------------------------
+    def read_combined(self):
+        parquet_dir = self.output_combined_dir / COMBINED_PARQUET_DIR
+        if pq is not None and parquet_dir.is_dir():
+            return read_combined_parquet(parquet_dir)
+
+        df = pd.read_csv(self.output_combined_dir / "all_data.csv")
+        df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT)
+        return df
+
+    # ---------------------------------------------------------
+    # 2. COMPUTE DERIVED COLUMNS
+    # ---------------------------------------------------------
+    def derive(self, df):
+        """
+        Vectorized over all tickers: one sort, then grouped cython ops.
+        """
+        df = df.sort_values(["Ticker", "date"], kind="stable").reset_index(drop=True)
+        by_ticker = df.groupby("Ticker", sort=False)
+
+        df["daily_return"] = by_ticker["close"].pct_change()
+        df["log_return"] = np.log1p(df["daily_return"])
+        df["cumulative_return"] = (1 + df["daily_return"]).groupby(df["Ticker"], sort=False).cumprod() - 1
+
+        running = df.groupby("Ticker", sort=False)["daily_return"].expanding()
+        df["return_mean"] = running.mean().reset_index(level=0, drop=True)
+        df["return_volatility"] = running.std().reset_index(level=0, drop=True)
+
+        df["running_max_close"] = by_ticker["close"].cummax()
+        df["drawdown"] = df["close"] / df["running_max_close"] - 1
+
+        return df[COMBINED_COLUMNS + DERIVED_COLUMNS]
+
+    # ---------------------------------------------------------
+    # 3. WRITE DERIVED DATASET
+    # ---------------------------------------------------------
+    def build(self):
+        """
+        Read → derive. Returns the derived frame (None if no data).
+        """
+        try:
+            df = self.read_combined()
+        except FileNotFoundError:
+            return None
+
+        if df.empty:
+            return None
+
+        return self.derive(df)
+
+    def write(self, derived):
+        """
+        Write the derived frame; returns the output path.
+        """
+        if pq is not None:
+            output_file = self.output_combined_dir / DERIVED_PARQUET
+            derived.to_parquet(output_file, index=False)
+        else:
+            output_file = self.output_combined_dir / DERIVED_CSV
+            derived.to_csv(output_file, index=False, date_format=DATE_FORMAT)
+
+        return output_file
+
+    def run(self):
+        """
+        Read → derive → write. Returns the output path (None if no data).
+        """
+        derived = self.build()
+        return None if derived is None else self.write(derived)
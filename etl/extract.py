@@ -1,8 +1,34 @@
 import os
+import re
 import yaml
 
 RAW_DIR = "data"
 
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Keys of the fixed daily-snapshot schema
+SNAPSHOT_FIELDS = {"Ticker", "close", "date", "high", "low", "month", "open", "volume"}
+
+# Plain scalars the fast reader resolves itself (same result as YAML 1.1 safe_load)
+_INT_RE = re.compile(r"[-+]?(?:0|[1-9][0-9]*)")
+_FLOAT_RE = re.compile(r"[-+]?[0-9]+\.[0-9]*(?:[eE][-+][0-9]+)?")
+_MONTH_RE = re.compile(r"[0-9]{4}-[0-9]{2}")
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9&._-]*")
+_KEY_VALUE_RE = re.compile(r"([A-Za-z_]+):(?: (.*))?")
+
+# Words YAML 1.1 resolves to bool / null instead of str
+_RESERVED_WORDS = {"yes", "no", "true", "false", "on", "off", "null"}
+
+
+class UnexpectedSnapshotFormat(ValueError):
+    """
+    Raised by the fast reader when a file is not a plain daily snapshot.
+    """
+
 
 def get_all_yaml_files():
     """
@@ -18,13 +44,96 @@ def get_all_yaml_files():
     return sorted(yaml_files)
 
 
+def parse_snapshot_scalar(value):
+    """
+    Resolve one scalar of the snapshot schema the way yaml.safe_load would.
+    Anything outside the handful of forms we emit raises UnexpectedSnapshotFormat.
+    """
+    if value == "":
+        return None
+
+    if value[0] == "'":
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != "'" or "'" in inner.replace("''", ""):
+            raise UnexpectedSnapshotFormat(value)
+        return inner.replace("''", "'")
+
+    if _INT_RE.fullmatch(value):
+        return int(value)
+    if _FLOAT_RE.fullmatch(value):
+        return float(value)
+    if _MONTH_RE.fullmatch(value):
+        return value
+    if _WORD_RE.fullmatch(value) and value.lower() not in _RESERVED_WORDS:
+        return value
+
+    raise UnexpectedSnapshotFormat(value)
+
+
+def parse_snapshot_lines(lines):
+    """
+    Line-oriented parser for the daily snapshot layout:
+
+        - Ticker: SBIN
+          close: 602.95
+          date: '2023-10-03 05:30:00'
+          ...
+
+    Returns a list of row dictionaries.
+    """
+    rows = []
+    row = None
+
+    for line in lines:
+        line = line.rstrip()
+        if not line:
+            continue
+
+        if line.startswith("- "):
+            row = {}
+            rows.append(row)
+            body = line[2:]
+        elif line.startswith("  ") and row is not None:
+            body = line[2:]
+        else:
+            raise UnexpectedSnapshotFormat(line)
+
+        match = _KEY_VALUE_RE.fullmatch(body)
+        if not match:
+            raise UnexpectedSnapshotFormat(line)
+
+        key, value = match.group(1), match.group(2) or ""
+        if key not in SNAPSHOT_FIELDS or key in row:
+            raise UnexpectedSnapshotFormat(line)
+
+        row[key] = parse_snapshot_scalar(value)
+
+    if not rows:
+        raise UnexpectedSnapshotFormat("no rows")
+
+    return rows
+
+
+def load_yaml(file_path):
+    """
+    Fast YAML load for daily snapshots.
+    Tries the line parser first, then falls back to the (C) safe loader.
+    """
+    with open(file_path, "r") as f:
+        text = f.read()
+
+    try:
+        return parse_snapshot_lines(text.splitlines())
+    except UnexpectedSnapshotFormat:
+        return yaml.load(text, Loader=YamlLoader)
+
+
 def process_yaml_file(file_path):
     """
     Load a YAML file and return a list of raw row dictionaries.
     """
     try:
-        with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
+        data = load_yaml(file_path)
 
         if not isinstance(data, list):
             print(f"WARNING: {file_path} does not contain a list")
@@ -1,17 +1,196 @@
 import os
+import csv
+import shutil
 import pandas as pd
+from collections import OrderedDict
 from pathlib import Path
 
+from etl.transform import DATE_FORMAT
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:   # Parquet output is optional
+    pa = pq = None
+
+# Symbol rows buffered (across all tickers) before they are written out
+DEFAULT_FLUSH_SIZE = 20000
+
+# Upper bound on <Ticker>.csv handles kept open at the same time
+DEFAULT_MAX_OPEN_FILES = 64
+
+# Month-partitioned Parquet copy of all_data.csv:
+#   output_combined/all_data_parquet/month=YYYY-MM/part-0.parquet
+COMBINED_PARQUET_DIR = "all_data_parquet"
+PARQUET_ROW_GROUP_ROWS = 16384
+
+COMBINED_COLUMNS = ["Ticker", "date", "month", "open", "high", "low", "close", "volume"]
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+# Streaming mode keeps at most this many month Parquet files open
+MAX_OPEN_PARQUET_MONTHS = 4
+
+
+def to_typed_frame(rows):
+    """
+    Clean rows → DataFrame with the column types stored in Parquet:
+    datetime64 date, float64 prices, nullable Int64 volume, str Ticker/month.
+    """
+    df = pd.DataFrame(rows, columns=COMBINED_COLUMNS)
+
+    df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT)
+    df["Ticker"] = df["Ticker"].astype(str)
+    df["month"] = df["month"].astype(str)
+
+    for column in PRICE_COLUMNS:
+        df[column] = pd.to_numeric(df[column]).astype("float64")
+    df["volume"] = pd.to_numeric(df["volume"]).astype("Int64")
+
+    return df
+
+
+def read_combined_parquet(dataset_dir, months=None, tickers=None, columns=None):
+    """
+    Read the month-partitioned Parquet dataset written by the Loader.
+
+    months  : only read these month=YYYY-MM partitions (directory pruning)
+    tickers : only these tickers (row groups are skipped via statistics)
+    columns : subset of columns to load
+    """
+    filters = []
+    if months is not None:
+        filters.append(("month", "in", list(months)))
+    if tickers is not None:
+        filters.append(("Ticker", "in", list(tickers)))
+
+    df = pd.read_parquet(dataset_dir, columns=columns, filters=filters or None)
+
+    # Partition values come back as a categorical
+    if "month" in df.columns:
+        df["month"] = df["month"].astype(str)
+
+    return df[[c for c in COMBINED_COLUMNS if c in df.columns]]
+
+
+def parquet_schema(with_month=True):
+    """
+    Arrow schema of the Parquet dataset (month lives in the directory name).
+    """
+    fields = [
+        ("Ticker", pa.string()),
+        ("date", pa.timestamp("us")),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.int64()),
+    ]
+    if with_month:
+        fields.insert(2, ("month", pa.string()))
+    return pa.schema(fields)
+
+
+class MonthlyAccumulator:
+    """
+    Running per-(month, Ticker) aggregates behind the monthly reports in
+    streaming mode. Memory grows with ticker-months, not rows.
+
+    Means use Kahan-compensated sums in arrival order, the same algorithm
+    as pandas' groupby mean / sum, so reports match the in-memory path.
+    """
+
+    AVG_FIELDS = ["open", "high", "low", "close"]
+
+    def __init__(self):
+        # (month, Ticker) -> {field: [sum, compensation, count]} + volume + rows
+        self.groups = {}
+        self.volume_is_float = False   # any float / missing volume → float sums
+
+    @staticmethod
+    def _kahan_add(state, value):
+        y = value - state[1]
+        t = state[0] + y
+        state[1] = (t - state[0]) - y
+        state[0] = t
+
+    def add(self, row):
+        month = row.get("month")
+        if month is None:
+            return   # groupby drops missing keys
+
+        key = (month, row.get("Ticker"))
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {
+                **{field: [0.0, 0.0, 0] for field in self.AVG_FIELDS},
+                "volume_float": [0.0, 0.0],
+                "volume_int": 0,
+                "rows": 0,
+            }
+
+        for field in self.AVG_FIELDS:
+            value = row.get(field)
+            if value is not None:
+                state = group[field]
+                self._kahan_add(state, float(value))
+                state[2] += 1
+
+        volume = row.get("volume")
+        if volume is None or isinstance(volume, float):
+            self.volume_is_float = True
+        if volume is not None:
+            self._kahan_add(group["volume_float"], float(volume))
+            if isinstance(volume, int):
+                group["volume_int"] += volume
+
+        if row.get("date") is not None:
+            group["rows"] += 1
+
+    def to_frame(self):
+        """
+        Same columns / order as the groupby in write_monthly_reports.
+        """
+        records = []
+        for (month, ticker), group in sorted(self.groups.items()):
+            record = {"month": month, "Ticker": ticker}
+            for field in self.AVG_FIELDS:
+                total, _, count = group[field]
+                record[f"{field}_avg"] = total / count if count else float("nan")
+            record["volume_sum"] = (
+                group["volume_float"][0] if self.volume_is_float else group["volume_int"]
+            )
+            record["rows"] = group["rows"]
+            records.append(record)
+
+        return pd.DataFrame(
+            records,
+            columns=["month", "Ticker", "open_avg", "high_avg", "low_avg",
+                     "close_avg", "volume_sum", "rows"],
+        )
+
 
 class Loader:
     """
     Loader class is responsible for writing clean, validated rows into:
     - Per-symbol CSV files  (SBIN.csv, TCS.csv, etc.)
     - Combined master CSV   (all_data.csv)
+    - Month-partitioned Parquet (all_data_parquet/month=YYYY-MM/)
     - Monthly summary reports (monthly_summary_YYYY-MM.csv)
+
+    Incremental runs use reset_symbol_csvs() / remove_dates() to drop
+    stale rows, write_combined_csv(append=True), and
+    write_combined_parquet / write_monthly_reports(rows, months) to
+    rewrite only touched months.
+
+    streaming=True keeps memory constant: rows go straight to all_data.csv
+    and the Parquet dataset as they arrive, and monthly reports come from
+    running per-(month, Ticker) accumulators. The write_* methods then
+    just finalize those outputs.
     """
 
-    def __init__(self, output_csv_dir, output_combined_dir, output_reports_dir):
+    def __init__(self, output_csv_dir, output_combined_dir, output_reports_dir,
+                 flush_size=DEFAULT_FLUSH_SIZE, max_open_files=DEFAULT_MAX_OPEN_FILES,
+                 streaming=False):
         self.output_csv_dir = Path(output_csv_dir)
         self.output_combined_dir = Path(output_combined_dir)
         self.output_reports_dir = Path(output_reports_dir)
@@ -24,6 +203,23 @@ class Loader:
         # Keep all rows in memory for combined CSV + monthly stats
         self.all_rows = []
 
+        # Batched symbol writer:
+        # flush_size <= 0 keeps the old one-row-per-write behaviour
+        self.flush_size = flush_size
+        self.max_open_files = max(1, max_open_files)
+        self._buffers = {}                 # ticker -> pending rows
+        self._buffered_rows = 0
+        self._open_files = OrderedDict()   # ticker -> (file handle, csv writer), LRU order
+
+        # Streaming mode state
+        self.streaming = streaming
+        self.monthly = MonthlyAccumulator()
+        self._combined_file = None         # (file handle, csv writer) for all_data.csv
+        self._parquet_pending = {}         # month -> rows waiting for a row group
+        self._parquet_pending_rows = 0
+        self._parquet_writers = OrderedDict()
+        self._parquet_parts = {}           # month -> files written so far
+
     # ---------------------------------------------------------
     # 1. WRITE / APPEND SYMBOL-WISE CSV
     # ---------------------------------------------------------
@@ -32,44 +228,239 @@ class Loader:
         Writes a clean row into its corresponding <Ticker>.csv file.
         If file doesn't exist → create with header.
         If file exists → append without header.
+
+        Rows are buffered per ticker and written out in blocks once
+        `flush_size` rows are pending; call close() once all rows are in.
         """
 
         ticker = row.get("Ticker")
         if not ticker:
             return   # Safe check
 
+        # Store for combined + monthly reports
+        if self.streaming:
+            self._stream_row(row)
+        else:
+            self.all_rows.append(row)
+
+        if self.flush_size <= 0:
+            self._write_rows(ticker, [row])
+            self._close_file(ticker)
+            return
+
+        self._buffers.setdefault(ticker, []).append(row)
+        self._buffered_rows += 1
+
+        if self._buffered_rows >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write out every pending symbol row. Open handles stay open.
+        """
+        for ticker in list(self._buffers):
+            self._flush_ticker(ticker)
+
+        for handle, _ in self._open_files.values():
+            handle.flush()
+
+    def close(self):
+        """
+        Flush pending symbol rows and release all open file handles.
+        """
+        self.flush()
+
+        for ticker in list(self._open_files):
+            self._close_file(ticker)
+
+    def _flush_ticker(self, ticker):
+        rows = self._buffers.pop(ticker, None)
+        if rows:
+            self._buffered_rows -= len(rows)
+            self._write_rows(ticker, rows)
+
+    def _write_rows(self, ticker, rows):
+        """
+        Append a block of rows through a pooled handle.
+        Values are written exactly as a one-row DataFrame.to_csv would.
+        """
+        _, writer = self._get_writer(ticker, header=list(rows[0].keys()))
+        writer.writerows(
+            ["" if value is None else value for value in row.values()]
+            for row in rows
+        )
+
+    def _get_writer(self, ticker, header):
+        if ticker in self._open_files:
+            self._open_files.move_to_end(ticker)
+            return self._open_files[ticker]
+
+        # Pool is full → close the least recently used handle
+        while len(self._open_files) >= self.max_open_files:
+            self._close_file(next(iter(self._open_files)))
+
         file_path = self.output_csv_dir / f"{ticker}.csv"
-        df = pd.DataFrame([row])
+        write_header = not file_path.exists() or file_path.stat().st_size == 0
+
+        handle = open(file_path, "a", newline="")
+        writer = csv.writer(handle, lineterminator=os.linesep)
+        if write_header:
+            writer.writerow(header)
 
-        # Write new file OR append to existing file
-        if not file_path.exists():
-            df.to_csv(file_path, index=False)
+        self._open_files[ticker] = (handle, writer)
+        return self._open_files[ticker]
+
+    def _close_file(self, ticker):
+        handle, _ = self._open_files.pop(ticker)
+        handle.close()
+
+    def _stream_row(self, row):
+        """
+        Streaming mode: send one row to every combined output right away.
+        """
+        if self._combined_file is None:
+            self._start_streaming(header=list(row.keys()))
+
+        self._combined_file[1].writerow(["" if value is None else value for value in row.values()])
+        self.monthly.add(row)
+
+        if pq is not None:
+            month = row.get("month")
+            self._parquet_pending.setdefault(month, []).append(row)
+            self._parquet_pending_rows += 1
+
+            # Bounded buffer: flush every pending month as row groups
+            if self._parquet_pending_rows >= PARQUET_ROW_GROUP_ROWS:
+                for pending_month in list(self._parquet_pending):
+                    self._write_parquet_group(pending_month)
+
+    def _start_streaming(self, header):
+        handle = open(self.output_combined_dir / "all_data.csv", "w", newline="")
+        writer = csv.writer(handle, lineterminator=os.linesep)
+        writer.writerow(header)
+        self._combined_file = (handle, writer)
+
+        shutil.rmtree(self.output_combined_dir / COMBINED_PARQUET_DIR, ignore_errors=True)
+
+    def _write_parquet_group(self, month):
+        """
+        Write a month's pending rows as one row group of its Parquet file.
+        """
+        rows = self._parquet_pending.pop(month, None)
+        if not rows:
+            return
+
+        self._parquet_pending_rows -= len(rows)
+
+        df = to_typed_frame(rows).sort_values(["Ticker", "date"], kind="stable")
+        table = pa.Table.from_pandas(
+            df.drop(columns="month"), schema=parquet_schema(with_month=False), preserve_index=False
+        )
+
+        if month in self._parquet_writers:
+            self._parquet_writers.move_to_end(month)
         else:
-            df.to_csv(file_path, mode="a", header=False, index=False)
+            while len(self._parquet_writers) >= MAX_OPEN_PARQUET_MONTHS:
+                self._parquet_writers.popitem(last=False)[1].close()
 
-        # Store for combined + monthly reports
-        self.all_rows.append(row)
+            # A month seen again after its file was closed gets a new part file
+            part = self._parquet_parts.get(month, 0)
+            self._parquet_parts[month] = part + 1
+
+            month_dir = self.output_combined_dir / COMBINED_PARQUET_DIR / f"month={month}"
+            month_dir.mkdir(parents=True, exist_ok=True)
+            self._parquet_writers[month] = pq.ParquetWriter(
+                month_dir / f"part-{part}.parquet", table.schema
+            )
+
+        self._parquet_writers[month].write_table(table)
 
     # ---------------------------------------------------------
     # 2. WRITE COMBINED CSV FILE (ALL TICKERS)
     # ---------------------------------------------------------
-    def write_combined_csv(self):
+    def write_combined_csv(self, append=False):
         """
         Writes all rows collected during ETL into a single dataset.
         Useful for Power BI, Streamlit, and analytics.
+
+        append=True adds this run's rows to an existing all_data.csv.
+        In streaming mode the file is already written; this closes it.
+        Values are then formatted per row, like the per-symbol CSVs.
         """
 
+        if self.streaming:
+            if self._combined_file is not None:
+                self._combined_file[0].close()
+            return
+
         if not self.all_rows:
             return
 
         df = pd.DataFrame(self.all_rows)
         output_file = self.output_combined_dir / "all_data.csv"
-        df.to_csv(output_file, index=False)
+
+        if append and output_file.exists():
+            df.to_csv(output_file, mode="a", header=False, index=False)
+        else:
+            df.to_csv(output_file, index=False)
+
+    # ---------------------------------------------------------
+    # 3. WRITE MONTH-PARTITIONED PARQUET DATASET
+    # ---------------------------------------------------------
+    def write_combined_parquet(self, rows=None, months=None):
+        """
+        Same rows as all_data.csv, as typed, month-partitioned Parquet.
+        Each month is sorted by Ticker + date, so readers can prune by
+        month (directory) and by ticker (row-group statistics).
+
+        rows   : rows to write (defaults to every row of this run)
+        months : only replace these month partitions
+        """
+
+        if pq is None:
+            print("pyarrow not installed → skipping Parquet output")
+            return
+
+        if self.streaming and rows is None:
+            for month in list(self._parquet_pending):
+                self._write_parquet_group(month)
+            while self._parquet_writers:
+                self._parquet_writers.popitem(last=False)[1].close()
+            return
+
+        if rows is None:
+            rows = self.all_rows
+
+        dataset_dir = self.output_combined_dir / COMBINED_PARQUET_DIR
+
+        if months is None:
+            shutil.rmtree(dataset_dir, ignore_errors=True)
+        else:
+            for month in months:
+                shutil.rmtree(dataset_dir / f"month={month}", ignore_errors=True)
+
+        if not rows:
+            return
+
+        df = to_typed_frame(rows)
+        if months is not None:
+            df = df[df["month"].isin(set(months))]
+
+        df = df.sort_values(["month", "Ticker", "date"], kind="stable")
+
+        pq.write_to_dataset(
+            pa.Table.from_pandas(df, schema=parquet_schema(), preserve_index=False),
+            root_path=dataset_dir,
+            partition_cols=["month"],
+            basename_template="part-{i}.parquet",
+            row_group_size=PARQUET_ROW_GROUP_ROWS,
+            existing_data_behavior="overwrite_or_ignore",
+        )
 
     # ---------------------------------------------------------
-    # 3. GENERATE MONTHLY SUMMARY REPORTS
+    # 4. GENERATE MONTHLY SUMMARY REPORTS
     # ---------------------------------------------------------
-    def write_monthly_reports(self):
+    def write_monthly_reports(self, rows=None, months=None):
         """
         Monthly summary per (month, Ticker):
         - Average open, high, low, close
@@ -77,27 +468,96 @@ class Loader:
         - Row count
 
         Creates file: monthly_summary_YYYY-MM.csv
+
+        rows   : rows to summarise (defaults to every row of this run)
+        months : only (re)write these months; a listed month without rows
+                 has its stale report removed
         """
 
-        if not self.all_rows:
-            return
+        if months is not None:
+            for month in months:
+                stale_file = self.output_reports_dir / f"monthly_summary_{month}.csv"
+                if stale_file.exists():
+                    stale_file.unlink()
 
-        df = pd.DataFrame(self.all_rows)
+        if self.streaming and rows is None:
+            # Built from the running accumulators, no row data needed
+            grouped = self.monthly.to_frame()
+        else:
+            if rows is None:
+                rows = self.all_rows
+
+            if not rows:
+                return
 
-        # Ensure month column exists
-        if "month" not in df.columns:
-            df["month"] = df["date"].str.slice(0, 7)
+            df = pd.DataFrame(rows)
 
-        grouped = df.groupby(["month", "Ticker"]).agg(
-            open_avg=("open", "mean"),
-            high_avg=("high", "mean"),
-            low_avg=("low", "mean"),
-            close_avg=("close", "mean"),
-            volume_sum=("volume", "sum"),
-            rows=("date", "count"),
-        ).reset_index()
+            # Ensure month column exists
+            if "month" not in df.columns:
+                df["month"] = df["date"].str.slice(0, 7)
+
+            grouped = df.groupby(["month", "Ticker"]).agg(
+                open_avg=("open", "mean"),
+                high_avg=("high", "mean"),
+                low_avg=("low", "mean"),
+                close_avg=("close", "mean"),
+                volume_sum=("volume", "sum"),
+                rows=("date", "count"),
+            ).reset_index()
+
+        if months is not None:
+            grouped = grouped[grouped["month"].isin(set(months))]
 
         # Output each month into its own CSV
         for month, data in grouped.groupby("month"):
             output_file = self.output_reports_dir / f"monthly_summary_{month}.csv"
             data.to_csv(output_file, index=False)
+
+    # ---------------------------------------------------------
+    # 5. CLEAN-UP FOR FULL / INCREMENTAL RUNS
+    # ---------------------------------------------------------
+    def reset_symbol_csvs(self):
+        """
+        Delete existing <Ticker>.csv files so a full run does not append
+        a second copy of the history.
+        """
+        self.close()
+
+        for file_path in self.output_csv_dir.glob("*.csv"):
+            file_path.unlink()
+
+    def remove_dates(self, dates):
+        """
+        Drop every row whose date is in `dates` from the per-symbol CSVs
+        and all_data.csv (used when a snapshot changed or was deleted).
+        """
+        dates = set(dates)
+        if not dates:
+            return
+
+        self.close()
+
+        csv_files = sorted(self.output_csv_dir.glob("*.csv"))
+        csv_files.append(self.output_combined_dir / "all_data.csv")
+
+        for file_path in csv_files:
+            if file_path.exists():
+                self._filter_csv(file_path, lambda row: row.get("date") not in dates)
+
+    def _filter_csv(self, file_path, keep):
+        """
+        Rewrite a CSV keeping only rows where keep(row_dict) is true.
+        Field text is copied through unchanged.
+        """
+        tmp_path = file_path.with_suffix(".csv.tmp")
+
+        with open(file_path, "r", newline="") as src, open(tmp_path, "w", newline="") as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst, lineterminator=os.linesep)
+
+            header = next(reader, None)
+            if header is not None:
+                writer.writerow(header)
+                writer.writerows(row for row in reader if keep(dict(zip(header, row))))
+
+        os.replace(tmp_path, file_path)
@@ -0,0 +1,139 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+
+
+class Manifest:
+    """
+    Manifest keeps track of every YAML file the ETL has already ingested,
+    so incremental runs only touch new or changed snapshots.
+
+    Stored as JSON:
+        { "<yaml path>": {
+              "size": ..., "mtime_ns": ..., "sha256": ...,
+              "dates": [...],    # trade dates loaded from the file
+              "months": [...]    # months those rows belong to
+          }, ... }
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                self.entries = json.load(f)
+
+    # ---------------------------------------------------------
+    # 1. CHANGE DETECTION
+    # ---------------------------------------------------------
+    @staticmethod
+    def content_hash(file_path):
+        """
+        SHA-256 of the file contents.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def diff(self, yaml_files):
+        """
+        Split files into (new, changed, removed) against the manifest.
+
+        Size + mtime are checked first; a file is only hashed when its
+        stat differs, and counts as changed only if the hash differs too.
+        """
+        new, changed = [], []
+
+        for file_path in yaml_files:
+            entry = self.entries.get(file_path)
+            if entry is None:
+                new.append(file_path)
+                continue
+
+            stat = os.stat(file_path)
+            if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                continue
+
+            if self.content_hash(file_path) == entry["sha256"]:
+                # Touched but identical → just refresh the stat
+                entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+            else:
+                changed.append(file_path)
+
+        present = set(yaml_files)
+        removed = sorted(path for path in self.entries if path not in present)
+
+        return new, changed, removed
+
+    # ---------------------------------------------------------
+    # 2. UPDATES
+    # ---------------------------------------------------------
+    def record(self, file_path, dates, months):
+        """
+        Mark a file as ingested, with the dates / months it produced.
+        """
+        stat = os.stat(file_path)
+        self.entries[file_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self.content_hash(file_path),
+            "dates": sorted(dates),
+            "months": sorted(months),
+        }
+
+    def forget(self, file_path):
+        return self.entries.pop(file_path, None)
+
+    # ---------------------------------------------------------
+    # 3. LOOKUPS
+    # ---------------------------------------------------------
+    def dates_of(self, file_paths):
+        return {date for path in file_paths for date in self.entries.get(path, {}).get("dates", [])}
+
+    def months_of(self, file_paths):
+        return {month for path in file_paths for month in self.entries.get(path, {}).get("months", [])}
+
+    def files_sharing_dates(self, file_paths):
+        """
+        (files, dates): `file_paths` plus every ingested file holding rows
+        for any of their trade dates (transitively), and all those dates.
+        Outputs drop rows by date, so these files are reloaded together.
+        """
+        files, dates = set(file_paths), self.dates_of(file_paths)
+
+        while True:
+            sharing = {
+                path for path, entry in self.entries.items()
+                if path not in files and dates.intersection(entry["dates"])
+            }
+            if not sharing:
+                return sorted(files), dates
+
+            files |= sharing
+            dates |= self.dates_of(sharing)
+
+    def files_for_months(self, months):
+        """
+        Sorted list of ingested files holding rows for any of `months`.
+        """
+        months = set(months)
+        return sorted(
+            path for path, entry in self.entries.items()
+            if months.intersection(entry["months"])
+        )
+
+    def save(self):
+        """
+        Write atomically so an interrupted run never leaves half a manifest.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,207 @@
+import os
+import csv
+import sys
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from etl.load import COMBINED_COLUMNS
+
+# Peak RSS comes from getrusage, which Windows does not provide
+try:
+    import resource
+except ImportError:
+    resource = None
+
+STAGES = ["extract", "transform", "load", "derive", "store"]
+
+
+def peak_rss_mb(who="self"):
+    """
+    High-water mark of resident memory in MB (None where unsupported).
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(usage.ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024), 1)
+
+
+class RunMetrics:
+    """
+    RunMetrics collects what one ETL run did, per stage:
+    - wall time, rows in / out, bytes read
+    - rejected rows by reason (the rows themselves go to a quarantine CSV)
+    - per-file latency: parse (extract), normalize (transform), load
+
+    With worker processes, extract / transform seconds are the summed
+    per-file times measured inside the workers, not wall time.
+
+    Peak memory is reported for the whole run (process high-water mark,
+    which cannot be attributed to one stage); per-stage allocation peaks
+    come from the profiler (--profile, *.alloc.txt).
+
+    save() writes the JSON run report; summary() is a one-line digest.
+    With a `profiler` (utils.profiling.Profiler), stage() blocks are
+    profiled as well.
+    """
+
+    def __init__(self, report_path, quarantine_path, profiler=None):
+        self.report_path = Path(report_path)
+        self.quarantine_path = Path(quarantine_path)
+        self.profiler = profiler
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+
+        self.stages = {
+            name: {"seconds": 0.0, "rows_in": 0, "rows_out": 0, "bytes_read": 0}
+            for name in STAGES
+        }
+        self.files = []
+        self.rejects = Counter()
+
+        # Quarantine is per run: (re)created on the first reject
+        self._quarantine = None
+
+    # ---------------------------------------------------------
+    # 1. STAGES
+    # ---------------------------------------------------------
+    def add(self, stage, seconds=0.0, rows_in=0, rows_out=0, bytes_read=0):
+        """
+        Accumulate work into a stage (stages may run in several pieces).
+        """
+        record = self.stages[stage]
+        record["seconds"] += seconds
+        record["rows_in"] += rows_in
+        record["rows_out"] += rows_out
+        record["bytes_read"] += bytes_read
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time the enclosed block into stage `name`; the yielded dict takes
+        rows_in / rows_out / bytes_read counts.
+        """
+        counts = {}
+        handle = self.profiler.start(name) if self.profiler else None
+        started = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            elapsed = time.perf_counter() - started
+            if handle is not None:
+                self.profiler.stop(handle)
+            self.add(name, elapsed, **counts)
+
+    # ---------------------------------------------------------
+    # 2. FILES + REJECTS
+    # ---------------------------------------------------------
+    def record_file(self, file_path, rows_in, rows_out, extract_seconds, transform_seconds, load_seconds):
+        bytes_read = os.path.getsize(file_path)
+
+        self.add("extract", extract_seconds, rows_out=rows_in, bytes_read=bytes_read)
+        self.add("transform", transform_seconds, rows_in=rows_in, rows_out=rows_out)
+        self.add("load", load_seconds, rows_in=rows_out, rows_out=rows_out)
+
+        self.files.append({
+            "file": str(file_path),
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "bytes": bytes_read,
+            "seconds": round(extract_seconds + transform_seconds + load_seconds, 6),
+        })
+
+    def reject(self, file_path, row, reason):
+        """
+        Count a rejected row and append it to the quarantine CSV.
+        """
+        self.rejects[reason] += 1
+
+        if self._quarantine is None:
+            self.quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(self.quarantine_path, "w", newline="")
+            writer = csv.DictWriter(handle, fieldnames=["file", "reason"] + COMBINED_COLUMNS,
+                                    extrasaction="ignore")
+            writer.writeheader()
+            self._quarantine = (handle, writer)
+
+        self._quarantine[1].writerow({**row, "file": file_path, "reason": reason})
+
+    # ---------------------------------------------------------
+    # 3. REPORT
+    # ---------------------------------------------------------
+    def file_latency(self):
+        if not self.files:
+            return {}
+
+        seconds = np.array([record["seconds"] for record in self.files]) * 1000
+        return {
+            "files": len(self.files),
+            "p50_ms": round(float(np.percentile(seconds, 50)), 3),
+            "p90_ms": round(float(np.percentile(seconds, 90)), 3),
+            "p99_ms": round(float(np.percentile(seconds, 99)), 3),
+            "max_ms": round(float(seconds.max()), 3),
+        }
+
+    def report(self):
+        stages = {
+            name: {**record, "seconds": round(record["seconds"], 4)}
+            for name, record in self.stages.items()
+        }
+        return {
+            "started": self.started_at.isoformat(timespec="seconds"),
+            "wall_seconds": round(time.perf_counter() - self.started, 4),
+            "rows_in": self.stages["transform"]["rows_in"],
+            "rows_loaded": self.stages["load"]["rows_out"],
+            "rows_rejected": sum(self.rejects.values()),
+            "rejects_by_reason": dict(self.rejects),
+            "quarantine_file": str(self.quarantine_path) if self.rejects else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "workers_peak_rss_mb": peak_rss_mb("children"),
+            "stages": stages,
+            "file_latency": self.file_latency(),
+            "files": self.files,
+        }
+
+    def close(self):
+        if self._quarantine is not None:
+            self._quarantine[0].close()
+            self._quarantine = None
+
+    def save(self):
+        """
+        Close the quarantine file and write the JSON run report.
+        """
+        self.close()
+
+        # A clean run leaves no quarantine file from an earlier run behind
+        if not self.rejects and self.quarantine_path.exists():
+            self.quarantine_path.unlink()
+
+        report = self.report()
+
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.report_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        return report
+
+    def summary(self, report=None):
+        report = report or self.report()
+        stage_times = " ".join(
+            f"{name}={record['seconds']:.2f}s" for name, record in report["stages"].items()
+        )
+        rejects = ", ".join(f"{reason}={count}" for reason, count in report["rejects_by_reason"].items())
+        memory = f" | peak {report['peak_rss_mb']} MB" if report["peak_rss_mb"] is not None else ""
+
+        return (
+            f"ETL run: {report['rows_loaded']:,}/{report['rows_in']:,} rows loaded "
+            f"from {report['file_latency'].get('files', 0)} files in {report['wall_seconds']:.2f}s "
+            f"| rejected {report['rows_rejected']}" + (f" ({rejects})" if rejects else "") +
+            f" | {stage_times}{memory}"
+        )
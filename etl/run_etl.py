@@ -1,74 +1,337 @@
 import sys
 import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 # Ensure the project root is added to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from etl.extract import get_all_yaml_files, process_yaml_file
 from etl.transform import Transformer
-from etl.load import Loader
+from etl.load import Loader, DEFAULT_FLUSH_SIZE
+from etl.manifest import Manifest
+from etl.derive import Deriver
+from etl.store import SqliteStore, STORE_FILE
+from etl.metrics import RunMetrics
+from utils.profiling import PROFILE_ENABLED, Profiler, disable_in_worker
 
+# Record of ingested YAML files, used by --incremental runs
+MANIFEST_PATH = os.path.join("output_combined", "etl_manifest.json")
 
-def run_etl():
+# Embedded, indexed store the dashboard can query with filter pushdown
+STORE_PATH = os.path.join("output_combined", STORE_FILE)
+
+# Per-run metrics (JSON) and the rows rejected by validation (CSV)
+REPORT_PATH = os.path.join("output_combined", "etl_run_report.json")
+QUARANTINE_PATH = os.path.join("output_combined", "etl_quarantine.csv")
+
+
+def extract_and_transform(file_path):
+    """
+    Parse one YAML file and normalize its rows as one NormalizedBatch.
+    Returns (batch, (parse seconds, normalize seconds)).
+    Kept at module level so worker processes can run it.
+    """
+    transformer = Transformer()
+
+    started = time.perf_counter()
+    entries = process_yaml_file(file_path)
+    parsed = time.perf_counter()
+    batch = transformer.normalize_batch(entries)
+
+    return batch, (parsed - started, time.perf_counter() - parsed)
+
+
+def iter_normalized_files(yaml_files, workers=1):
+    """
+    Yield (file_path, NormalizedBatch, timings) in the order of `yaml_files`.
+
+    With workers > 1 the files are parsed in a process pool; results are
+    still yielded in input order so the Loader sees exactly what the
+    serial path would.
+    """
+    if workers <= 1:
+        for file_path in yaml_files:
+            yield (file_path, *extract_and_transform(file_path))
+        return
+
+    # A few chunks per worker keeps IPC overhead low without starving the pool
+    chunksize = max(1, len(yaml_files) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=disable_in_worker) as pool:
+        results = pool.map(extract_and_transform, yaml_files, chunksize=chunksize)
+        for file_path, (batch, timings) in zip(yaml_files, results):
+            yield file_path, batch, timings
+
+
+def valid_rows(batch):
+    return [row for row, is_valid in zip(batch.to_rows(), batch.valid) if is_valid]
+
+
+def run_etl(flush_size=DEFAULT_FLUSH_SIZE, workers=1, incremental=False, streaming=False,
+            verbose=False, profile=PROFILE_ENABLED):
 
     print("\n=========== ETL PIPELINE STARTED ===========\n")
 
-    # ---------------------------------------------------------
-    # 1. INITIALIZE TRANSFORMER + LOADER
-    # ---------------------------------------------------------
+    # Stage timings, row counts, rejects (quarantined) and memory;
+    # with profile=True each stage is also run under cProfile + tracemalloc
+    profiler = Profiler("etl", enabled=profile)
+    metrics = RunMetrics(REPORT_PATH, QUARANTINE_PATH, profiler)
+    completed = False
+
+    try:
+        completed = _run_stages(metrics, profiler, flush_size, workers, incremental, streaming, verbose)
+    finally:
+        # ---------------------------------------------------------
+        # 9. RUN REPORT (EVERY EXIT PATH, SO IT NEVER SHOWS AN OLDER RUN)
+        # ---------------------------------------------------------
+        report = metrics.save()
+        print(f"\n{metrics.summary(report)}")
+        print(f"Run report: {REPORT_PATH}")
+        if report["rows_rejected"]:
+            print(f"Rejected rows quarantined in {QUARANTINE_PATH}")
+        if profiler.run_dir is not None:
+            print(f"Profiles written to {profiler.run_dir}")
+
+    if completed:
+        print("\n=========== ETL PIPELINE COMPLETED SUCCESSFULLY ===========\n")
+
+
+def _run_stages(metrics, profiler, flush_size, workers, incremental, streaming, verbose):
+    """
+    Every ETL stage; returns False when the run stops early (no YAML
+    files, or nothing changed since the last incremental run).
+    """
     transformer = Transformer()
 
+    # Without a manifest there is nothing to be incremental against: the
+    # existing outputs are of unknown origin, so rebuild them from scratch
+    manifest = Manifest(MANIFEST_PATH)
+    if incremental and not manifest.entries:
+        print("No ETL manifest found: running a full rebuild instead of incremental.\n")
+        incremental = False
+
+    # ---------------------------------------------------------
+    # 1. INITIALIZE LOADER (TRANSFORM RUNS PER FILE)
+    # ---------------------------------------------------------
     loader = Loader(
         output_csv_dir="output_csv",
         output_combined_dir="output_combined",
-        output_reports_dir="output_reports"
+        output_reports_dir="output_reports",
+        flush_size=flush_size,
+        # Incremental runs only hold the touched months anyway
+        streaming=streaming and not incremental
     )
 
     # ---------------------------------------------------------
     # 2. GET ALL YAML FILES FROM DATA FOLDER
     # ---------------------------------------------------------
-    yaml_files = get_all_yaml_files()
+    with metrics.stage("extract"):
+        yaml_files = get_all_yaml_files()
 
     if not yaml_files:
         print("No YAML files found. ETL stopped.")
-        return
+        return False
 
     print(f"Total YAML files found: {len(yaml_files)}\n")
 
     # ---------------------------------------------------------
-    # 3. PROCESS EACH YAML FILE
+    # 3. DECIDE WHICH FILES NEED PROCESSING
     # ---------------------------------------------------------
-    for file in yaml_files:
-        print(f"Processing File: {file}")
+    touched_months = set()
+
+    if incremental:
+        new_files, changed_files, removed_files = manifest.diff(yaml_files)
+        stale_files = changed_files + removed_files
+
+        print(f"Incremental run: {len(new_files)} new, {len(changed_files)} changed, "
+              f"{len(removed_files)} removed\n")
+
+        if not new_files and not stale_files:
+            manifest.save()
+            print("Outputs already up to date. ETL stopped.")
+            return False
 
-        raw_rows = process_yaml_file(file)
+        # Rows loaded from changed / deleted snapshots are dropped first.
+        # Outputs are filtered by trade date, so unchanged snapshots sharing
+        # one of those dates lose their rows as well and are reloaded
+        affected_files, stale_dates = manifest.files_sharing_dates(stale_files)
+        reloaded_files = [file for file in affected_files if file not in stale_files]
+        if reloaded_files:
+            print(f"Reloading {len(reloaded_files)} unchanged files sharing their dates\n")
+
+        touched_months |= manifest.months_of(affected_files)
+        loader.remove_dates(stale_dates)
+        for file in affected_files:
+            manifest.forget(file)
+
+        files_to_process = sorted(new_files + changed_files + reloaded_files)
+    else:
+        # Full rebuild: start from empty per-symbol CSVs and manifest
+        loader.reset_symbol_csvs()
+        manifest.entries.clear()
+        files_to_process = yaml_files
+
+    # ---------------------------------------------------------
+    # 4. PROCESS EACH YAML FILE
+    # ---------------------------------------------------------
+    started = time.perf_counter()
+    rows_loaded = 0
+    rows_by_file = {}   # incremental runs reuse these for monthly reports
+
+    if workers > 1:
+        print(f"Parsing with {workers} worker processes\n")
+
+    # Parse, normalize and load are interleaved per file: profiled as one
+    # stage (with workers, parsing happens in the worker processes)
+    files_profile = profiler.start("process_files")
+
+    for file, batch, (extract_seconds, transform_seconds) in iter_normalized_files(files_to_process, workers):
+        if verbose:
+            print(f"Processing File: {file}")
+        load_started = time.perf_counter()
+        file_rows = []
 
         # -----------------------------------------------------
-        # 4. TRANSFORM EACH RAW ROW
+        # 5. SPLIT NORMALIZED ROWS BY THE VALIDATION MASK
         # -----------------------------------------------------
-        for raw in raw_rows:
+        for clean_row, is_valid in zip(batch.to_rows(), batch.valid):
 
-            clean_row = transformer.normalize(raw)
-
-            if not transformer.is_valid(clean_row):
-                print("Skipping invalid row:", clean_row)
+            if not is_valid:
+                metrics.reject(file, clean_row, transformer.reject_reason(clean_row))
                 continue
 
             # Send clean row to Loader (write symbol CSV)
             loader.write_symbol_csv(clean_row)
+            file_rows.append(clean_row)
+
+        rows_loaded += len(file_rows)
+        manifest.record(
+            file,
+            dates={row["date"] for row in file_rows},
+            months={row["month"] for row in file_rows if row["month"]}
+        )
+        if incremental:
+            rows_by_file[file] = file_rows
+
+        metrics.record_file(
+            file, len(batch), len(file_rows),
+            extract_seconds, transform_seconds, time.perf_counter() - load_started
+        )
 
     # ---------------------------------------------------------
-    # 5. AFTER ALL ROWS DONE → CREATE FINAL DATASETS
+    # 6. AFTER ALL ROWS DONE → CREATE FINAL DATASETS
     # ---------------------------------------------------------
 
+    profiler.stop(files_profile)
+
+    # Write out any symbol rows still buffered in the Loader
+    with metrics.stage("load"):
+        loader.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\nLoaded {rows_loaded} rows in {elapsed:.2f}s "
+          f"({rows_loaded / elapsed:,.0f} rows/s)")
+
+    # Combined outputs count towards the load stage
+    finalize_started = time.perf_counter()
+    outputs_profile = profiler.start("write_outputs")
+
     print("\nWriting combined CSV...")
-    loader.write_combined_csv()
+    loader.write_combined_csv(append=incremental)
+
+    if incremental:
+        # Only months touched by this run; their other snapshots are re-read
+        touched_months |= manifest.months_of(rows_by_file)
+        month_files = manifest.files_for_months(touched_months)
+
+        unread = [file for file in month_files if file not in rows_by_file]
+        for file, batch, _ in iter_normalized_files(unread, workers):
+            rows_by_file[file] = valid_rows(batch)
+
+        month_rows = [row for file in month_files for row in rows_by_file[file]]
+        touched_months = sorted(touched_months)
+
+        print("Writing Parquet dataset...")
+        loader.write_combined_parquet(month_rows, months=touched_months)
+
+        print("Writing monthly summary reports...")
+        loader.write_monthly_reports(month_rows, months=touched_months)
+        print(f"Months refreshed: {', '.join(touched_months)}")
+    else:
+        print("Writing Parquet dataset...")
+        loader.write_combined_parquet()
 
-    print("Writing monthly summary reports...")
-    loader.write_monthly_reports()
+        print("Writing monthly summary reports...")
+        loader.write_monthly_reports()
 
-    print("\n=========== ETL PIPELINE COMPLETED SUCCESSFULLY ===========\n")
+    profiler.stop(outputs_profile)
+    metrics.add("load", time.perf_counter() - finalize_started)
+
+    # ---------------------------------------------------------
+    # 7. DERIVED ANALYTICS (RETURNS + RUNNING STATS)
+    # ---------------------------------------------------------
+    # Running stats depend on each ticker's full history, so this stage
+    # always rebuilds from the combined dataset (vectorized, ~linear)
+    print("Building derived analytics dataset...")
+    deriver = Deriver("output_combined")
+
+    with metrics.stage("derive") as counts:
+        derived = deriver.build()
+        if derived is not None:
+            counts["rows_in"] = counts["rows_out"] = len(derived)
+            print(f"Derived dataset written: {deriver.write(derived)}")
+
+    if derived is not None:
+        # -----------------------------------------------------
+        # 8. EMBEDDED SQLITE STORE (INDEXED ON TICKER + DATE)
+        # -----------------------------------------------------
+        print("Writing SQLite store...")
+        with metrics.stage("store") as counts:
+            counts["rows_in"] = len(derived)
+            rows = counts["rows_out"] = SqliteStore(STORE_PATH).write(derived)
+        print(f"SQLite store written: {STORE_PATH} ({rows} rows)")
+
+    manifest.save()
+    return True
 
 
 if __name__ == "__main__":
-    run_etl()
+    arg_parser = argparse.ArgumentParser(description="Run the stock data ETL pipeline")
+    arg_parser.add_argument(
+        "--flush-size", type=int, default=DEFAULT_FLUSH_SIZE,
+        help="symbol rows buffered before writing per-ticker CSVs (0 = write every row)"
+    )
+    arg_parser.add_argument(
+        "--workers", type=int, default=1,
+        help="processes used to parse and normalize YAML files (1 = serial)"
+    )
+    mode = arg_parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--incremental", action="store_true",
+        help="only process new / changed YAML files recorded against the manifest"
+    )
+    mode.add_argument(
+        "--streaming", action="store_true",
+        help="full run in constant memory: stream rows to the combined outputs"
+    )
+    arg_parser.add_argument(
+        "--verbose", action="store_true",
+        help="print every file as it is processed"
+    )
+    arg_parser.add_argument(
+        "--profile", action="store_true", default=PROFILE_ENABLED,
+        help="profile each stage (cProfile + tracemalloc) into profiles/etl_<timestamp>/ "
+             "(also enabled by STOCK_PROFILE=1)"
+    )
+    args = arg_parser.parse_args()
+
+    run_etl(
+        flush_size=args.flush_size,
+        workers=args.workers,
+        incremental=args.incremental,
+        streaming=args.streaming,
+        verbose=args.verbose,
+        profile=args.profile
+    )
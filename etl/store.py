@@ -0,0 +1,95 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from etl.transform import DATE_FORMAT
+
+STORE_FILE = "stock_prices.db"
+STORE_TABLE = "stock_prices"
+
+
+class SqliteStore:
+    """
+    SqliteStore writes the dashboard's embedded store: one SQLite file with
+    the stock_prices table (plus any derived columns) and indexes on
+    (ticker, trade_date) and trade_date, so date / ticker filters can be
+    answered with index range scans instead of loading everything.
+
+    Each run rebuilds the file next to the old one and swaps it in with
+    os.replace, so readers never see a half-written store.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    # ---------------------------------------------------------
+    # 1. WRITE
+    # ---------------------------------------------------------
+    def write(self, df):
+        """
+        Replace the store with `df` (combined or derived frame with
+        Ticker + date columns). Returns the number of rows written.
+        """
+        table = self.to_table(df)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        completed = False
+        conn = sqlite3.connect(tmp_path)
+        try:
+            columns = ", ".join(f"{name} {self.sql_type(dtype)}" for name, dtype in table.dtypes.items())
+            conn.execute(f"CREATE TABLE {STORE_TABLE} ({columns}, PRIMARY KEY (ticker, trade_date))")
+
+            placeholders = ", ".join("?" for _ in table.columns)
+            conn.executemany(
+                f"INSERT INTO {STORE_TABLE} VALUES ({placeholders})",
+                table.astype(object).where(table.notna(), None).itertuples(index=False, name=None)
+            )
+
+            # The primary key already indexes (ticker, trade_date);
+            # date-only filters get their own index
+            conn.execute(f"CREATE INDEX idx_{STORE_TABLE}_trade_date ON {STORE_TABLE} (trade_date)")
+            conn.execute("ANALYZE")
+            conn.commit()
+            completed = True
+        finally:
+            conn.close()
+            # A failed build leaves the current store in place and no tmp file
+            if not completed:
+                tmp_path.unlink(missing_ok=True)
+
+        os.replace(tmp_path, self.path)
+        return len(table)
+
+    # ---------------------------------------------------------
+    # 2. HELPERS
+    # ---------------------------------------------------------
+    @staticmethod
+    def to_table(df):
+        """
+        Store layout: ticker / trade_date keys, dates as DATE_FORMAT text
+        (sorts like the datetime), sorted by key for locality. A snapshot
+        delivered twice repeats its keys: the last row per key is kept.
+        """
+        table = df.rename(columns={"Ticker": "ticker", "date": "trade_date"})
+        table["trade_date"] = pd.to_datetime(table["trade_date"]).dt.strftime(DATE_FORMAT)
+        table = table.drop_duplicates(["ticker", "trade_date"], keep="last")
+        table = table.sort_values(["ticker", "trade_date"], kind="stable")
+
+        if "month" in table.columns:
+            table["month"] = table["month"].astype(str)
+
+        return table.reset_index(drop=True)
+
+    @staticmethod
+    def sql_type(dtype):
+        if pd.api.types.is_integer_dtype(dtype):
+            return "INTEGER"
+        if pd.api.types.is_float_dtype(dtype):
+            return "REAL"
+        return "TEXT"
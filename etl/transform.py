@@ -1,8 +1,83 @@
+import numpy as np
 import pandas as pd
 import re
 
+from datetime import datetime
 from dateutil import parser
 
+# Layout the snapshots already use; tried with strptime before dateutil
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+FIXED_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}")
+
+# Cleaned numeric text where numpy parsing matches int() / float() exactly
+INT_TEXT = r"[+-]?[0-9]{1,18}"
+FLOAT_TEXT = r"[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def object_array(values):
+    """
+    1-D object array from any list (never broadcasts nested values).
+    """
+    values = list(values)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+class NormalizedBatch:
+    """
+    Columnar output of Transformer.normalize_batch().
+
+    - columns["Ticker" | "date" | "month"] : object arrays
+    - columns[<numeric field>]             : float64 arrays (NaN = missing)
+    - int_values / is_int                  : exact int64 values where
+                                             normalize() returns an int
+    - valid                                : is_valid() as a boolean mask
+    """
+
+    def __init__(self, columns, int_values, is_int, valid, large_ints=None):
+        self.columns = columns
+        self.int_values = int_values
+        self.is_int = is_int
+        self.valid = valid
+
+        # {(field, index): int} for ints that do not fit in int64
+        self.large_ints = large_ints or {}
+
+    def __len__(self):
+        return len(self.valid)
+
+    def numeric_values(self, field):
+        """
+        Python values of a numeric column, exactly as normalize() returns them.
+        """
+        floats = self.columns[field]
+        missing = np.isnan(floats)
+        is_int = self.is_int[field]
+        ints = self.int_values[field].tolist()
+
+        values = []
+        for i, value in enumerate(floats.tolist()):
+            if missing[i]:
+                values.append(None)
+            elif is_int[i]:
+                values.append(self.large_ints.get((field, i), ints[i]))
+            else:
+                values.append(value)
+
+        return values
+
+    def to_rows(self):
+        """
+        Row dicts in input order, identical to normalize() on each entry.
+        """
+        fields = ["Ticker", "date", "month"] + Transformer.NUMERIC_FIELDS
+        columns = [self.columns[field].tolist() for field in fields[:3]]
+        columns += [self.numeric_values(field) for field in Transformer.NUMERIC_FIELDS]
+
+        return [dict(zip(fields, values)) for values in zip(*columns)]
+
+
 class Transformer:
     """
     Transformer class cleans and standardizes each YAML entry into
@@ -118,3 +193,151 @@ class Transformer:
         )
         
         """
+
+    def reject_reason(self, row):
+        """
+        Why is_valid() rejects `row` (None if it is valid).
+        """
+        if not row.get("Ticker"):
+            return "missing_ticker"
+        if not row.get("date"):
+            return "invalid_date"
+        if row.get("close") is None:
+            return "missing_close"
+
+        return None
+
+    # ---------------------------------------------------------
+    # 5. BATCH (COLUMNAR) NORMALIZATION
+    # ---------------------------------------------------------
+    def normalize_batch(self, entries):
+        """
+        Normalize a list of raw YAML entries (usually one file) into a
+        NormalizedBatch. Same results as normalize() + is_valid(), but:
+        - each distinct date string is parsed once, strptime first
+        - numbers are cleaned with vectorized string ops; only values the
+          fast path cannot reproduce exactly go through clean_number()
+        - validation is done with boolean masks
+        """
+        entries = list(entries)
+
+        tickers = object_array(entry.get("Ticker") for entry in entries)
+        dates = self.normalize_date_column([entry.get("date") for entry in entries])
+        has_date = pd.notna(dates)
+
+        # Extract or auto-generate month
+        months = object_array(entry.get("month") for entry in entries)
+        fill_month = ~months.astype(bool) & has_date
+        if fill_month.any():
+            months[fill_month] = [date[:7] for date in dates[fill_month]]
+
+        columns = {"Ticker": tickers, "date": dates, "month": months}
+        int_values, is_int, large_ints = {}, {}, {}
+
+        # Clean numeric fields
+        for field in self.NUMERIC_FIELDS:
+            floats, ints, int_mask, overflow = self.clean_number_column(
+                [entry.get(field) for entry in entries]
+            )
+            columns[field], int_values[field], is_int[field] = floats, ints, int_mask
+            large_ints.update({(field, i): value for i, value in overflow.items()})
+
+        valid = tickers.astype(bool) & has_date & ~np.isnan(columns["close"])
+
+        return NormalizedBatch(columns, int_values, is_int, valid, large_ints)
+
+    def normalize_date_column(self, values):
+        """
+        normalize_date() over a column; each distinct string is parsed once.
+        """
+        dates = object_array(values)
+        is_str = np.array([type(value) is str for value in values], dtype=bool)
+
+        if is_str.any():
+            codes, uniques = pd.factorize(dates[is_str])
+            parsed = object_array(self._parse_fixed_date(value) for value in uniques)
+            dates[is_str] = parsed[codes]
+
+        # datetime objects, numbers, ... keep the dateutil path
+        for i in np.flatnonzero(~is_str):
+            dates[i] = self.normalize_date(values[i])
+
+        return dates
+
+    def _parse_fixed_date(self, value):
+        if FIXED_DATE_RE.fullmatch(value):
+            try:
+                return datetime.strptime(value, DATE_FORMAT).strftime(DATE_FORMAT)
+            except ValueError:
+                pass
+
+        return self.normalize_date(value)
+
+    def clean_number_column(self, values):
+        """
+        clean_number() over a column.
+
+        Returns (float64 values, int64 values, is_int mask, {index: big int}).
+        """
+        n = len(values)
+        floats = np.full(n, np.nan)
+        ints = np.zeros(n, dtype=np.int64)
+        is_int = np.zeros(n, dtype=bool)
+        overflow = {}
+
+        raw = object_array(values)
+        kinds = object_array(type(value) for value in values)
+        done = raw == None   # noqa: E711  (None → missing, elementwise)
+
+        # YAML ints: str() has no "." → int(value)
+        int_rows = np.flatnonzero(kinds == int)
+        if len(int_rows):
+            try:
+                ints[int_rows] = raw[int_rows].astype(np.int64)
+                floats[int_rows] = ints[int_rows]
+                is_int[int_rows] = done[int_rows] = True
+            except OverflowError:
+                pass
+
+        # YAML floats: repr() is fixed-point (always has a ".") for
+        # 0 and 1e-4 <= |x| < 1e16 → float(value) is the value itself
+        float_rows = np.flatnonzero(kinds == float)
+        if len(float_rows):
+            as_float = raw[float_rows].astype(np.float64)
+            magnitude = np.abs(as_float)
+            plain = (as_float == 0) | ((magnitude >= 1e-4) & (magnitude < 1e16))
+            floats[float_rows[plain]] = as_float[plain]
+            done[float_rows[plain]] = True
+
+        # Strings: drop commas / spaces, then parse what numpy reads exactly
+        str_rows = np.flatnonzero(kinds == str)
+        if len(str_rows):
+            text = pd.Series(raw[str_rows], dtype=object).str.replace(",", "", regex=False).str.strip()
+            int_text = text.str.fullmatch(INT_TEXT).to_numpy(dtype=bool)
+            float_text = text.str.fullmatch(FLOAT_TEXT).to_numpy(dtype=bool)
+            text = text.to_numpy(dtype=object)
+
+            rows = str_rows[int_text]
+            ints[rows] = text[int_text].astype(np.int64)
+            floats[rows] = ints[rows]
+            is_int[rows] = done[rows] = True
+
+            rows = str_rows[float_text]
+            floats[rows] = text[float_text].astype(np.float64)
+            done[rows] = True
+
+        # Everything else (bools, nan/inf, 1e+16, huge ints, junk text ...)
+        for i in np.flatnonzero(~done):
+            value = self.clean_number(values[i])
+
+            if isinstance(value, int):
+                is_int[i] = True
+                if INT64_MIN <= value <= INT64_MAX:
+                    ints[i] = floats[i] = value
+                else:
+                    overflow[i] = value
+                    floats[i] = np.inf if value > 0 else -np.inf
+            elif value is not None:
+                floats[i] = value
+
+        return floats, ints, is_int, overflow
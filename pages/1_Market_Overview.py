@@ -4,6 +4,8 @@ import numpy as np
 
 from utils.data_loader import load_data
 from utils.filters import apply_global_filters
+from utils.prefetch import get_window_returns
+from utils.price_index import top_k
 
 # --------------------------------------------------
 # PAGE CONFIG
@@ -30,22 +32,8 @@ if not required_cols.issubset(df.columns):
 # --------------------------------------------------
 # YEARLY RETURNS CALCULATION
 # --------------------------------------------------
-df = df.sort_values(["Ticker", "date"])
-
-yearly = (
-    df.groupby("Ticker")
-    .agg(
-        start_price=("close", "first"),
-        end_price=("close", "last"),
-        avg_volume=("volume", "mean")
-    )
-    .reset_index()
-)
-
-yearly["yearly_return"] = (
-    (yearly["end_price"] - yearly["start_price"]) /
-    yearly["start_price"]
-)
+# First / last close of the filter window per ticker, from the price index
+yearly = get_window_returns(df)
 
 # --------------------------------------------------
 # MARKET KPIs
@@ -76,13 +64,8 @@ c5.metric("📊 Avg Volume", f"{avg_volume:,.0f}")
 # --------------------------------------------------
 # TOP GAINERS & LOSERS
 # --------------------------------------------------
-top_gainers = yearly.sort_values(
-    "yearly_return", ascending=False
-).head(10)
-
-top_losers = yearly.sort_values(
-    "yearly_return", ascending=True
-).head(10)
+top_gainers = top_k(yearly, "yearly_return", 10, largest=True)
+top_losers = top_k(yearly, "yearly_return", 10, largest=False)
 
 st.markdown("### 🟢 Top 10 Gainers & 🔴 Top 10 Losers")
 
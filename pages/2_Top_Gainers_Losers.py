@@ -4,6 +4,8 @@ import numpy as np
 
 from utils.data_loader import load_data
 from utils.filters import apply_global_filters
+from utils.prefetch import get_monthly_returns, get_window_returns
+from utils.price_index import period_leaders, top_k
 
 # --------------------------------------------------
 # PAGE CONFIG
@@ -30,34 +32,15 @@ if not required_cols.issubset(df.columns):
 # --------------------------------------------------
 # YEARLY RETURN CALCULATION
 # --------------------------------------------------
-df = df.sort_values(["Ticker", "date"])
-
-returns = (
-    df.groupby("Ticker")
-    .agg(
-        start_price=("close", "first"),
-        end_price=("close", "last")
-    )
-    .reset_index()
-)
-
-returns["yearly_return"] = (
-    (returns["end_price"] - returns["start_price"]) /
-    returns["start_price"]
-)
+returns = get_window_returns(df).copy()
 
 returns["Return (%)"] = returns["yearly_return"] * 100
 
 # --------------------------------------------------
 # TOP 10 GAINERS & LOSERS
 # --------------------------------------------------
-top_gainers = returns.sort_values(
-    "yearly_return", ascending=False
-).head(10)
-
-top_losers = returns.sort_values(
-    "yearly_return", ascending=True
-).head(10)
+top_gainers = top_k(returns, "yearly_return", 10, largest=True)
+top_losers = top_k(returns, "yearly_return", 10, largest=False)
 
 # --------------------------------------------------
 # KPI SUMMARY
@@ -123,6 +106,35 @@ st.bar_chart(
     chart_df.set_index("Ticker")["Return (%)"]
 )
 
+# --------------------------------------------------
+# MONTHLY LEADERS (RETURN OVER EVERY MONTH)
+# --------------------------------------------------
+st.markdown("### 📅 Monthly Leaders")
+
+monthly = get_monthly_returns(df)
+
+month_best = period_leaders(monthly, k=1, largest=True)
+month_worst = period_leaders(monthly, k=1, largest=False)
+
+monthly_leaders = (
+    month_best[["period", "Ticker", "return"]]
+    .merge(month_worst[["period", "Ticker", "return"]], on="period", suffixes=(" (Best)", " (Worst)"))
+    .rename(columns={"period": "Month"})
+)
+monthly_leaders["return (Best)"] *= 100
+monthly_leaders["return (Worst)"] *= 100
+
+st.dataframe(
+    monthly_leaders.rename(columns={
+        "Ticker (Best)": "Best Stock",
+        "return (Best)": "Best Return (%)",
+        "Ticker (Worst)": "Worst Stock",
+        "return (Worst)": "Worst Return (%)",
+    })
+    .style.format({"Best Return (%)": "{:.2f}%", "Worst Return (%)": "{:.2f}%"}),
+    use_container_width=True
+)
+
 # --------------------------------------------------
 # INSIGHTS
 # --------------------------------------------------
@@ -3,6 +3,7 @@ import pandas as pd
 
 from utils.data_loader import load_data
 from utils.filters import apply_global_filters
+from utils.prefetch import get_page_result
 
 # ----------------------------------------------------
 # PAGE CONFIG
@@ -18,23 +19,10 @@ st.caption("Risk assessment using standard deviation of daily returns")
 df = load_data()
 df = apply_global_filters(df)
 
-df = df.sort_values(["Ticker", "date"])
-
-# ----------------------------------------------------
-# CALCULATE DAILY RETURNS
-# ----------------------------------------------------
-df["daily_return"] = df.groupby("Ticker")["close"].pct_change()
-
 # ----------------------------------------------------
-# VOLATILITY CALCULATION
+# VOLATILITY OF DAILY RETURNS
 # ----------------------------------------------------
-volatility = (
-    df.groupby("Ticker")["daily_return"]
-    .std()
-    .reset_index(name="volatility")
-)
-
-volatility["volatility_pct"] = volatility["volatility"] * 100
+volatility = get_page_result("volatility", df)
 
 top_volatile = volatility.sort_values(
     "volatility_pct", ascending=False
@@ -4,6 +4,9 @@ import matplotlib.pyplot as plt
 
 from utils.data_loader import load_data
 from utils.filters import apply_global_filters
+from utils.analytics import top_cumulative
+from utils.downsample import chart_data
+from utils.prefetch import get_page_result
 
 # ----------------------------------------------------
 # PAGE CONFIG
@@ -23,32 +26,14 @@ if df.empty:
     st.stop()
 
 # ----------------------------------------------------
-# SORT DATA (VERY IMPORTANT)
+# SORTED DAILY + CUMULATIVE RETURNS
 # ----------------------------------------------------
-df = df.sort_values(["Ticker", "date"])
-
-# ----------------------------------------------------
-# DAILY RETURNS
-# ----------------------------------------------------
-df["daily_return"] = df.groupby("Ticker")["close"].pct_change()
-
-# ----------------------------------------------------
-# CUMULATIVE RETURNS (✅ FIXED)
-# ----------------------------------------------------
-df["cumulative_return"] = (
-    df.groupby("Ticker")["daily_return"]
-      .transform(lambda x: (1 + x).cumprod() - 1)
-)
+df = get_page_result("cumulative_returns", df)
 
 # ----------------------------------------------------
 # SELECT TOP 5 PERFORMERS (FINAL VALUE)
 # ----------------------------------------------------
-final_returns = (
-    df.groupby("Ticker")["cumulative_return"]
-      .last()
-      .sort_values(ascending=False)
-      .head(5)
-)
+final_returns = top_cumulative(df, n=5)
 
 top_stocks = final_returns.index.tolist()
 df_top = df[df["Ticker"].isin(top_stocks)]
@@ -59,7 +44,13 @@ df_top = df[df["Ticker"].isin(top_stocks)]
 fig, ax = plt.subplots(figsize=(12, 6))
 
 for ticker in top_stocks:
-    temp = df_top[df_top["Ticker"] == ticker]
+    # About one point per pixel of the figure's width
+    temp = chart_data(
+        df_top[df_top["Ticker"] == ticker],
+        width_px=int(fig.get_figwidth() * fig.dpi),
+        x="date",
+        columns=["cumulative_return"]
+    )
     ax.plot(
         temp["date"],
         temp["cumulative_return"],
@@ -1,10 +1,15 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 
 from utils.data_loader import load_data
 from utils.filters import apply_global_filters
+from utils.analytics import correlation_matrix
+from utils.correlation import rolling_corr_vs
+from utils.downsample import chart_data
+from utils.prefetch import get_page_result, memoized
 
 # ----------------------------------------------------
 # PAGE CONFIG
@@ -20,50 +25,49 @@ st.caption("Relationship analysis using daily returns")
 df = load_data()
 df = apply_global_filters(df)
 
-df = df.sort_values(["Ticker", "date"])
-
 # ----------------------------------------------------
-# CALCULATE DAILY RETURNS
+# DAILY RETURNS MATRIX (date × Ticker)
+# Stocks with too many missing values are dropped
 # ----------------------------------------------------
-df["daily_return"] = df.groupby("Ticker")["close"].pct_change()
+returns_df = get_page_result("returns_matrix", df)
 
-returns_df = df.pivot(
-    index="date",
-    columns="Ticker",
-    values="daily_return"
-)
+if returns_df.shape[1] < 2:
+    st.warning("Select at least two stocks with enough data for correlation analysis.")
+    st.stop()
 
-# Drop stocks with too many missing values
-returns_df = returns_df.dropna(axis=1, thresh=int(len(returns_df) * 0.7))
+# ----------------------------------------------------
+# CORRELATION MATRIX — FULL UNIVERSE (cached per filter state)
+# ----------------------------------------------------
+full_corr = memoized("correlation_matrix", correlation_matrix, returns_df)
 
 # ----------------------------------------------------
 # USER CONTROL — NUMBER OF STOCKS
 # ----------------------------------------------------
-max_stocks = min(returns_df.shape[1], 15)
+max_stocks = returns_df.shape[1]
 
-selected_n = st.slider(
-    "Select number of stocks for correlation analysis",
-    min_value=5,
-    max_value=max_stocks,
-    value=min(10, max_stocks)
-)
-
-returns_df = returns_df.iloc[:, :selected_n]
+# A slider needs min < max; with only two stocks both are shown
+if max_stocks > 2:
+    selected_n = st.slider(
+        "Select number of stocks for correlation analysis",
+        min_value=2,
+        max_value=max_stocks,
+        value=min(10, max_stocks)
+    )
+else:
+    selected_n = max_stocks
 
-# ----------------------------------------------------
-# CORRELATION MATRIX
-# ----------------------------------------------------
-corr_matrix = returns_df.corr()
+corr_matrix = full_corr.iloc[:selected_n, :selected_n]
 
 # ----------------------------------------------------
 # HEATMAP
 # ----------------------------------------------------
 st.subheader("📊 Correlation Heatmap")
 
+# Cell labels stop being readable past ~15 stocks
 fig, ax = plt.subplots(figsize=(10, 8))
 sns.heatmap(
     corr_matrix,
-    annot=True,
+    annot=selected_n <= 15,
     cmap="coolwarm",
     center=0,
     linewidths=0.5,
@@ -82,7 +86,7 @@ st.subheader("📌 Key Insights")
 
 # Exclude self-correlation
 mask = ~pd.DataFrame(
-    pd.np.eye(corr_matrix.shape[0], dtype=bool),
+    np.eye(corr_matrix.shape[0], dtype=bool),
     index=corr_matrix.index,
     columns=corr_matrix.columns
 )
@@ -106,3 +110,46 @@ st.info(
     "📌 Correlation does not imply causation. "
     "This analysis helps in portfolio diversification, not price prediction."
 )
+
+st.divider()
+
+# ----------------------------------------------------
+# ROLLING CORRELATION
+# ----------------------------------------------------
+st.subheader("📈 Rolling Correlation")
+
+# The window slider needs at least a few days to choose from
+if len(returns_df) <= 6:
+    st.warning("Select a longer date range (at least 7 trading days) for rolling correlation.")
+    st.stop()
+
+EQUAL_WEIGHT = "Equal-weight index"
+tickers = returns_df.columns.tolist()
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    ticker = st.selectbox("Stock", tickers)
+
+with col2:
+    benchmark = st.selectbox(
+        "Compared with",
+        [EQUAL_WEIGHT] + [t for t in tickers if t != ticker]
+    )
+
+with col3:
+    max_window = min(120, len(returns_df) - 1)
+    window = st.slider(
+        "Window (trading days)",
+        min_value=min(5, max_window - 1),
+        max_value=max_window,
+        value=min(30, max_window)
+    )
+
+rolling = memoized(
+    "rolling_correlation", rolling_corr_vs,
+    returns_df, ticker, None if benchmark == EQUAL_WEIGHT else benchmark, window,
+    params=(ticker, benchmark, window)
+)
+
+st.line_chart(chart_data(rolling.rename(f"{ticker} vs {benchmark}")))
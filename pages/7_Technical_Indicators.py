@@ -0,0 +1,127 @@
+import streamlit as st
+import pandas as pd
+
+from utils.data_loader import load_data
+from utils.downsample import chart_data
+from utils.filters import apply_global_filters
+from utils.indicators import DEFAULT_PARAMS, compute_indicators, latest_snapshot
+from utils.prefetch import memoized
+
+# ----------------------------------------------------
+# PAGE CONFIG
+# ----------------------------------------------------
+st.set_page_config(page_title="Technical Indicators", layout="wide")
+
+st.title("📐 Technical Indicators")
+st.caption("Moving averages, RSI, Bollinger bands, ATR and rolling volatility")
+
+# ----------------------------------------------------
+# LOAD & FILTER DATA
+# ----------------------------------------------------
+df = load_data()
+df = apply_global_filters(df)
+
+if df.empty:
+    st.warning("No data available for selected filters.")
+    st.stop()
+
+# ----------------------------------------------------
+# USER CONTROL — INDICATOR WINDOWS
+# ----------------------------------------------------
+with st.expander("⚙️ Indicator settings"):
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        sma_window = st.number_input("SMA window", 2, 250, DEFAULT_PARAMS["sma_window"])
+        ema_span = st.number_input("EMA span", 2, 250, DEFAULT_PARAMS["ema_span"])
+
+    with col2:
+        rsi_period = st.number_input("RSI period", 2, 100, DEFAULT_PARAMS["rsi_period"])
+        atr_period = st.number_input("ATR period", 2, 100, DEFAULT_PARAMS["atr_period"])
+
+    with col3:
+        bollinger_window = st.number_input("Bollinger window", 2, 250, DEFAULT_PARAMS["bollinger_window"])
+        volatility_window = st.number_input("Volatility window", 2, 250, DEFAULT_PARAMS["volatility_window"])
+
+params = {
+    "sma_window": int(sma_window),
+    "ema_span": int(ema_span),
+    "rsi_period": int(rsi_period),
+    "bollinger_window": int(bollinger_window),
+    "bollinger_k": DEFAULT_PARAMS["bollinger_k"],
+    "atr_period": int(atr_period),
+    "volatility_window": int(volatility_window),
+}
+
+# ----------------------------------------------------
+# INDICATORS FOR EVERY SELECTED STOCK (one pass, cached)
+# ----------------------------------------------------
+indicators = memoized(
+    "indicators", compute_indicators, df, params,
+    params=tuple(sorted(params.items()))
+)
+
+# ----------------------------------------------------
+# SINGLE STOCK VIEW
+# ----------------------------------------------------
+ticker = st.selectbox("Select stock", sorted(indicators["Ticker"].unique()))
+stock = indicators[indicators["Ticker"] == ticker].set_index("date")
+
+st.subheader(f"📈 {ticker} — Price, Moving Averages & Bollinger Bands")
+st.line_chart(
+    chart_data(stock[["close", "sma", "ema", "bb_upper", "bb_lower"]]).rename(columns={
+        "close": "Close",
+        "sma": f"SMA {params['sma_window']}",
+        "ema": f"EMA {params['ema_span']}",
+        "bb_upper": "Upper band",
+        "bb_lower": "Lower band",
+    })
+)
+
+# The small charts below are about a third of the page wide
+SMALL_CHART_WIDTH = 400
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.markdown("**RSI**")
+    st.line_chart(chart_data(stock["rsi"], SMALL_CHART_WIDTH))
+
+with col2:
+    st.markdown("**ATR**")
+    st.line_chart(chart_data(stock["atr"], SMALL_CHART_WIDTH))
+
+with col3:
+    st.markdown("**Rolling Volatility (%)**")
+    st.line_chart(chart_data(stock["volatility"] * 100, SMALL_CHART_WIDTH))
+
+st.divider()
+
+# ----------------------------------------------------
+# SCREENER — LATEST VALUES FOR ALL STOCKS
+# ----------------------------------------------------
+st.subheader("🔎 Indicator Screener (latest date)")
+
+latest = latest_snapshot(indicators)
+latest["Signal"] = pd.cut(
+    latest["rsi"],
+    bins=[0, 30, 70, 100],
+    labels=["Oversold", "Neutral", "Overbought"],
+    include_lowest=True
+)
+
+st.dataframe(
+    latest[["Ticker", "close", "rsi", "atr", "volatility", "Signal"]]
+    .rename(columns={
+        "close": "Close",
+        "rsi": "RSI",
+        "atr": "ATR",
+        "volatility": "Volatility",
+    }),
+    use_container_width=True
+)
+
+st.info(
+    "📌 RSI above 70 is commonly read as overbought and below 30 as oversold. "
+    "Indicators describe past price behaviour and are not trading advice."
+)
@@ -0,0 +1,238 @@
+import os
+import threading
+import pandas as pd
+
+from utils.correlation import pairwise_corr
+from utils.ticker_index import sort_by_ticker_date
+
+# ----------------------------------------------------
+# Shared page computations
+# Each function takes the (filtered) long-format frame, or an
+# AnalyticsContext built over it, and returns the result a
+# dashboard page renders.
+# ----------------------------------------------------
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECTOR_MAP_PATH = os.path.join(BASE_DIR, "data", "sector_mapping.csv")
+
+
+def first_row_mask(df):
+    """
+    True on the first row of each ticker block (frame sorted by Ticker, date).
+    """
+    return df["Ticker"].ne(df["Ticker"].shift())
+
+
+def plain_tickers(result):
+    """
+    Per-ticker result tables use plain string tickers, so charts never
+    pick up unused categories from a categorical Ticker column.
+    """
+    return result.astype({"Ticker": str})
+
+
+def add_daily_returns(df):
+    """
+    Sort by Ticker + date and add the per-ticker daily close return.
+
+    When the ETL already derived daily_return it is reused; the first
+    selected row per ticker is masked, since its previous close lies
+    outside the selection.
+    """
+    df = sort_by_ticker_date(df)
+
+    if "daily_return" in df.columns:
+        df["daily_return"] = df["daily_return"].mask(first_row_mask(df))
+    else:
+        # float64 returns even when prices are held as float32 (compact mode)
+        close = df["close"].astype("float64")
+        df["daily_return"] = close.groupby(df["Ticker"], observed=True).pct_change()
+    return df
+
+
+class AnalyticsContext:
+    """
+    The filtered frame plus what the pages derive from it, each built
+    once on first use and then shared (read-only) by every computation:
+    - returns: sorted by Ticker + date, with daily_return
+    - pivot:   date × Ticker matrix of daily returns
+
+    Thread-safe, so the prefetch pool can share one context.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._returns = None
+        self._pivot = None
+        self._lock = threading.RLock()
+
+    @property
+    def returns(self):
+        with self._lock:
+            if self._returns is None:
+                self._returns = add_daily_returns(self.df)
+            return self._returns
+
+    @property
+    def pivot(self):
+        with self._lock:
+            if self._pivot is None:
+                self._pivot = self.returns.pivot(
+                    index="date",
+                    columns="Ticker",
+                    values="daily_return"
+                )
+            return self._pivot
+
+
+def as_context(data):
+    """
+    `data` itself if it is an AnalyticsContext, else a fresh one over the frame.
+    """
+    return data if isinstance(data, AnalyticsContext) else AnalyticsContext(data)
+
+
+def yearly_returns(data):
+    """
+    First / last close per ticker over the selected range,
+    plus average volume (Market Overview, Top Gainers & Losers).
+    """
+    # Only needs the sort; a context's returns frame already has it
+    df = data.returns if isinstance(data, AnalyticsContext) else sort_by_ticker_date(data)
+
+    yearly = (
+        df.groupby("Ticker", observed=True)
+        .agg(
+            start_price=("close", "first"),
+            end_price=("close", "last"),
+            avg_volume=("volume", "mean")
+        )
+        .reset_index()
+        .pipe(plain_tickers)
+    )
+
+    start_price = yearly["start_price"].astype("float64")
+    yearly["yearly_return"] = (
+        (yearly["end_price"] - start_price) /
+        start_price
+    )
+
+    return yearly
+
+
+def volatility(data):
+    """
+    Standard deviation of daily returns per ticker.
+    """
+    df = as_context(data).returns
+
+    result = (
+        df.groupby("Ticker", observed=True)["daily_return"]
+        .std()
+        .reset_index(name="volatility")
+        .pipe(plain_tickers)
+    )
+    result["volatility_pct"] = result["volatility"] * 100
+
+    return result
+
+
+def cumulative_returns(data):
+    """
+    Compounded return since the first selected date, per ticker.
+    """
+    # Shallow copy: the new columns never touch the shared returns frame
+    df = as_context(data).returns.copy(deep=False)
+    precomputed = "cumulative_return" in df.columns
+
+    if precomputed:
+        # Rebase the ETL's since-inception growth to the first selected date
+        first = first_row_mask(df)
+        growth = 1 + df["cumulative_return"].fillna(0)
+        base = growth.where(first).ffill()
+        df["cumulative_return"] = (growth / base - 1).mask(first)
+    else:
+        df["cumulative_return"] = (
+            df.groupby("Ticker", observed=True)["daily_return"]
+              .transform(lambda x: (1 + x).cumprod() - 1)
+        )
+
+    return df
+
+
+def top_cumulative(cumulative_df, n=5):
+    """
+    Final cumulative return of the `n` best performers
+    (takes the cumulative_returns() frame).
+    """
+    return (
+        cumulative_df.groupby("Ticker", observed=True)["cumulative_return"]
+        .last()
+        .nlargest(n)
+    )
+
+
+def load_sector_map(path=SECTOR_MAP_PATH):
+    sector_map = pd.read_csv(path)
+
+    # Normalize columns
+    sector_map.columns = sector_map.columns.str.lower()
+    sector_map["ticker"] = sector_map["ticker"].str.strip().str.upper()
+
+    return sector_map
+
+
+def sector_performance(data, sector_map=None):
+    """
+    Average monthly return by sector (empty if no ticker has a sector).
+    """
+    if sector_map is None:
+        sector_map = load_sector_map()
+
+    df = as_context(data).returns
+
+    monthly_returns = (
+        df.groupby(["Ticker", pd.Grouper(key="date", freq="ME")], observed=True)["daily_return"]
+        .mean()
+        .reset_index()
+    )
+
+    merged = monthly_returns.merge(
+        sector_map,
+        left_on="Ticker",
+        right_on="ticker",
+        how="inner"
+    )
+
+    return (
+        merged.groupby("sector")["daily_return"]
+        .mean()
+        .sort_values(ascending=False)
+    )
+
+
+def returns_matrix(data, min_coverage=0.7):
+    """
+    date × Ticker matrix of daily returns, dropping tickers with
+    less than `min_coverage` of the dates.
+    """
+    returns_df = as_context(data).pivot
+
+    return returns_df.dropna(axis=1, thresh=int(len(returns_df) * min_coverage))
+
+
+def correlation_matrix(returns_df):
+    """
+    Pairwise-complete correlation across every ticker in the matrix.
+    """
+    return pairwise_corr(returns_df)
+
+
+# Everything the pages need, by name (used by the prefetch layer)
+# (window returns for pages 1-2 come from the PriceIndex instead)
+PAGE_COMPUTATIONS = {
+    "volatility": volatility,
+    "cumulative_returns": cumulative_returns,
+    "sector_performance": sector_performance,
+    "returns_matrix": returns_matrix,
+}
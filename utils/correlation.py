@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------
+# Correlation engine over an aligned date × Ticker
+# returns matrix (NaN = no observation that day)
+# ----------------------------------------------------
+
+# Variance below this fraction of Σx² is rounding noise (constant series)
+RELATIVE_VAR_TOL = 1e-12
+
+
+def _undefined(n, var_x, var_y, sum_xx, sum_yy, min_periods):
+    """
+    Mask of correlations that are undefined: too few pairs, or a
+    (numerically) constant side.
+    """
+    return (
+        (n < max(min_periods, 2))
+        | (var_x <= RELATIVE_VAR_TOL * sum_xx)
+        | (var_y <= RELATIVE_VAR_TOL * sum_yy)
+    )
+
+
+def pairwise_corr(returns_df, min_periods=1):
+    """
+    Pearson correlation of every column pair over the dates both columns
+    have (pairwise-complete, like DataFrame.corr), computed with a handful
+    of matrix products instead of a per-pair loop.
+    """
+    values = returns_df.to_numpy(dtype="float64")
+    valid = np.isfinite(values)
+
+    x = np.where(valid, values, 0.0)
+    m = valid.astype("float64")
+
+    # Per pair (i, j), sums over the rows where both are observed
+    n = m.T @ m                  # observations
+    sum_x = x.T @ m              # Σ x_i
+    sum_xx = (x * x).T @ m       # Σ x_i²
+    sum_xy = x.T @ x             # Σ x_i x_j
+    sum_y, sum_yy = sum_x.T, sum_xx.T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x, mean_y = sum_x / n, sum_y / n
+        cov = sum_xy - n * mean_x * mean_y
+        var_x = sum_xx - n * mean_x ** 2
+        var_y = sum_yy - n * mean_y ** 2
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr = np.clip(corr, -1.0, 1.0)
+    undefined = _undefined(n, var_x, var_y, sum_xx, sum_yy, min_periods)
+    corr[undefined] = np.nan
+    np.fill_diagonal(corr, np.where(np.diag(undefined), np.nan, 1.0))
+
+    return pd.DataFrame(corr, index=returns_df.columns, columns=returns_df.columns)
+
+
+def equal_weight_index(returns_df):
+    """
+    Daily return of an equal-weight portfolio of every column
+    (mean of the returns observed that day).
+    """
+    return returns_df.mean(axis=1, skipna=True).rename("Equal-weight index")
+
+
+def rolling_corr(x, y, window, min_periods=None):
+    """
+    Rolling Pearson correlation of two aligned series.
+
+    Window sums come from running (cumulative) sums, so each step adds
+    the newest pair and drops the oldest: O(n) for the whole series,
+    independent of `window`. Pairs with a missing side are skipped.
+    """
+    if min_periods is None:
+        min_periods = window
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    valid = np.isfinite(x) & np.isfinite(y)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    def window_sum(values):
+        running = np.concatenate(([0.0], np.cumsum(values)))
+        start = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+        return running[1:] - running[start]
+
+    n = window_sum(valid.astype("float64"))
+    sum_x, sum_y = window_sum(x), window_sum(y)
+    sum_xx, sum_yy, sum_xy = window_sum(x * x), window_sum(y * y), window_sum(x * y)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * sum_xy - sum_x * sum_y
+        var_x = n * sum_xx - sum_x ** 2
+        var_y = n * sum_yy - sum_y ** 2
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[_undefined(n, var_x, var_y, n * sum_xx, n * sum_yy, min_periods)] = np.nan
+    return corr
+
+
+def rolling_corr_vs(returns_df, ticker, benchmark, window):
+    """
+    Rolling correlation of `ticker` against `benchmark`: another ticker,
+    or None for the equal-weight index of all columns.
+    """
+    if benchmark is None:
+        benchmark_returns = equal_weight_index(returns_df)
+    else:
+        benchmark_returns = returns_df[benchmark]
+
+    corr = rolling_corr(returns_df[ticker], benchmark_returns, window)
+    return pd.Series(corr, index=returns_df.index, name=ticker)
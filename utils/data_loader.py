@@ -1,10 +1,85 @@
+import os
+import sqlite3
+from contextlib import closing
 import pandas as pd
 import streamlit as st
 
+from etl.load import PRICE_COLUMNS, read_combined_parquet
+from etl.transform import DATE_FORMAT
+from utils.price_index import PriceIndex
+from utils.profiling import PAGE_PROFILER
+from utils.ticker_index import TickerIndex, is_ticker_date_sorted
+
+CSV_PATH = "output_combined/all_data.csv"
+PARQUET_DIR = "output_combined/all_data_parquet"
+
+# Written by the ETL derive stage: sorted by Ticker, date with
+# daily / log / cumulative returns and running stats precomputed
+DERIVED_PARQUET = "output_combined/derived_data.parquet"
+DERIVED_CSV = "output_combined/derived_data.csv"
+
+# Compact mode (default): categorical Ticker / month, float32 prices,
+# the narrowest integer volume. Set DASHBOARD_COMPACT=0 to disable.
+COMPACT_MODE = os.environ.get("DASHBOARD_COMPACT", "1") != "0"
+COMPACT_PRICE_COLUMNS = PRICE_COLUMNS + ["running_max_close"]
+
+# Backend: "memory" loads the whole dataset once and filters in pandas;
+# "sqlite" queries the ETL's indexed store (output_combined/stock_prices.db)
+# with the sidebar filters pushed down as SQL predicates.
+DATA_BACKEND = os.environ.get("DASHBOARD_BACKEND", "memory")
+STORE_PATH = "output_combined/stock_prices.db"
+
+
+def using_store():
+    return DATA_BACKEND == "sqlite" and os.path.exists(STORE_PATH)
+
+
+def dataset_version():
+    """
+    (source path, mtime_ns) of the dataset load_data() reads.
+    Changes whenever the ETL rewrites its output, so caches keyed on it
+    never serve results computed from an older run.
+    """
+    if using_store():
+        return STORE_PATH, os.stat(STORE_PATH).st_mtime_ns
+
+    # Prefer the derived dataset, then the typed, month-partitioned Parquet output
+    for path in (DERIVED_PARQUET, DERIVED_CSV, PARQUET_DIR, CSV_PATH):
+        if os.path.exists(path):
+            return path, os.stat(path).st_mtime_ns
+
+    return CSV_PATH, 0
+
+
+def load_data(compact=COMPACT_MODE):
+    """
+    Full dataset (memory backend). With the sqlite backend nothing is
+    loaded up front: an empty frame with the store's columns is returned
+    and apply_global_filters pulls only the selected rows.
+    """
+    if using_store():
+        return query_store(compact=compact, limit=0)
+
+    with PAGE_PROFILER.stage("load_data"):
+        return _load_source(*dataset_version(), compact)
+
+
 @st.cache_data
-def load_data():
-    df = pd.read_csv("output_combined/all_data.csv")
+def _load_source(path, version, compact=COMPACT_MODE):
+    if path == DERIVED_PARQUET:
+        df = pd.read_parquet(path)
+    elif path == PARQUET_DIR:
+        df = read_combined_parquet(path)
+    else:
+        df = pd.read_csv(path)
+
+    return prepare_frame(df, compact)
 
+
+def prepare_frame(df, compact=COMPACT_MODE):
+    """
+    Canonical columns + dtypes, sorted by Ticker + date.
+    """
     # Canonical column cleanup
     df.columns = df.columns.str.strip()
 
@@ -13,6 +88,188 @@ def load_data():
         raise ValueError("Ticker column missing from dataset")
 
     df["Ticker"] = df["Ticker"].str.strip().str.upper()
-    df["date"] = pd.to_datetime(df["date"])
+
+    # The ETL always writes one date format; no per-value inference needed
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT)
+
+    # Sorted once here; filters slice per-ticker blocks and pages never re-sort
+    if not is_ticker_date_sorted(df):
+        df = df.sort_values(["Ticker", "date"], kind="stable")
+
+    df = df.reset_index(drop=True)
+
+    if compact:
+        df = compact_frame(df)
+
+    return df
+
+
+def compact_frame(df):
+    """
+    Downcast to the compact dtypes (smaller in memory and much cheaper
+    for st.cache_data to pickle on every cache hit).
+    """
+    df = df.astype({"Ticker": "category"})
+
+    if "month" in df.columns:
+        df["month"] = df["month"].astype("category")
+
+    for column in COMPACT_PRICE_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("float32")
+
+    volume = df["volume"]
+    if not volume.isna().any():
+        fits_int32 = volume.empty or (volume.min() >= -2**31 and volume.max() < 2**31)
+        df["volume"] = volume.astype("int32" if fits_int32 else "int64")
 
     return df
+
+
+def memory_footprint(df):
+    """
+    Per-column dtype + bytes (deep, i.e. including string contents).
+    """
+    usage = df.memory_usage(index=True, deep=True)
+    return pd.DataFrame({
+        "dtype": df.dtypes.astype(str).reindex(usage.index).fillna("index"),
+        "bytes": usage,
+    })
+
+
+def footprint_summary(compact=COMPACT_MODE):
+    """
+    One-line memory report for the loaded dataset.
+    """
+    return _footprint_summary(*dataset_version(), compact)
+
+
+@st.cache_data
+def _footprint_summary(path, version, compact):
+    df = _load_source(path, version, compact)
+    total_mb = memory_footprint(df)["bytes"].sum() / 1024 ** 2
+    mode = "compact" if compact else "full"
+    return f"{len(df):,} rows · {total_mb:.2f} MB in memory ({mode})"
+
+
+def load_ticker_index():
+    """
+    TickerIndex over the frame load_data() returns (shared, built once
+    per dataset version).
+    """
+    return _build_ticker_index(*dataset_version(), COMPACT_MODE)
+
+
+@st.cache_resource
+def _build_ticker_index(path, version, compact):
+    return TickerIndex(_load_source(path, version, compact))
+
+
+# ----------------------------------------------------
+# SQLite store backend (filter pushdown)
+# ----------------------------------------------------
+
+def _store_connection():
+    # Read-only: the dashboard never writes to the ETL's store
+    return closing(sqlite3.connect(f"file:{STORE_PATH}?mode=ro", uri=True))
+
+
+def _date_predicates(start_date, end_date):
+    # trade_date is stored as DATE_FORMAT text, which sorts like the datetime
+    conditions, params = [], []
+    if start_date is not None:
+        conditions.append("trade_date >= ?")
+        params.append(pd.Timestamp(start_date).strftime(DATE_FORMAT))
+    if end_date is not None:
+        conditions.append("trade_date <= ?")
+        params.append(pd.Timestamp(end_date).strftime(DATE_FORMAT))
+    return conditions, params
+
+
+def store_date_range():
+    """
+    (first, last) trade date in the store; (None, None) when it is empty.
+    """
+    return _store_date_range(*dataset_version())
+
+
+@st.cache_data
+def _store_date_range(path, version):
+    with _store_connection() as conn:
+        first, last = conn.execute("SELECT MIN(trade_date), MAX(trade_date) FROM stock_prices").fetchone()
+    if first is None:
+        return None, None
+    return pd.Timestamp(first), pd.Timestamp(last)
+
+
+def store_tickers(start_date=None, end_date=None):
+    """
+    Tickers with rows in the date range (answered from the indexes).
+    """
+    return _store_tickers(*dataset_version(), start_date, end_date)
+
+
+@st.cache_data
+def _store_tickers(path, version, start_date, end_date):
+    conditions, params = _date_predicates(start_date, end_date)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    with _store_connection() as conn:
+        rows = conn.execute(f"SELECT DISTINCT ticker FROM stock_prices{where} ORDER BY ticker", params)
+        return [ticker for (ticker,) in rows]
+
+
+def query_store(start_date=None, end_date=None, tickers=(), compact=COMPACT_MODE, limit=None):
+    """
+    Only the rows matching the filters, in the same layout load_data()
+    gives with the memory backend.
+    """
+    return _query_store(*dataset_version(), start_date, end_date, tuple(tickers), compact, limit)
+
+
+@st.cache_data
+def _query_store(path, version, start_date, end_date, tickers, compact, limit=None):
+    conditions, params = _date_predicates(start_date, end_date)
+
+    if tickers:
+        conditions.append(f"ticker IN ({', '.join('?' for _ in tickers)})")
+        params.extend(tickers)
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    limit_clause = "" if limit is None else f" LIMIT {int(limit)}"
+
+    with _store_connection() as conn:
+        df = pd.read_sql_query(
+            f"SELECT * FROM stock_prices{where} ORDER BY ticker, trade_date{limit_clause}",
+            conn, params=params
+        )
+
+    df = df.rename(columns={"ticker": "Ticker", "trade_date": "date"})
+    return prepare_frame(df, compact)
+
+
+# ----------------------------------------------------
+# Shared indexes
+# ----------------------------------------------------
+
+def price_index_for(df):
+    """
+    PriceIndex to answer window queries for the filtered frame `df`:
+    the shared full-dataset index (memory backend), or one over the
+    already filtered rows (sqlite backend).
+    """
+    return PriceIndex(df) if using_store() else load_price_index()
+
+
+def load_price_index():
+    """
+    PriceIndex over the full loaded dataset (shared, built once per
+    dataset version); answers window-return queries without the frame.
+    """
+    return _build_price_index(*dataset_version(), COMPACT_MODE)
+
+
+@st.cache_resource
+def _build_price_index(path, version, compact):
+    return PriceIndex(_load_source(path, version, compact))
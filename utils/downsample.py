@@ -0,0 +1,131 @@
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ----------------------------------------------------
+# Shape-preserving downsampling for line charts
+# A chart can't show more points than it has pixel columns, so long
+# series are reduced to ~one point per pixel before rendering:
+# - "lttb":   Largest-Triangle-Three-Buckets (keeps the visual shape)
+# - "minmax": each bucket's min and max (keeps every peak / trough)
+# Series already shorter than the budget (e.g. a narrow date range)
+# are returned untouched.
+# ----------------------------------------------------
+
+DEFAULT_CHART_WIDTH = 1200   # px, a wide-layout chart
+DOWNSAMPLE_METHOD = os.environ.get("DASHBOARD_DOWNSAMPLE", "lttb")
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Positions of the `n_out` points LTTB keeps (first and last always).
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # n_out - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Third triangle vertex: mean of the next bucket (last point at the end)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a]))
+
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    Positions of each bucket's min and max (at most `n_out` points,
+    plus the first and last).
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+
+    picks = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        picks.extend((start + int(np.argmin(bucket)), start + int(np.argmax(bucket))))
+
+    return np.unique(picks)
+
+
+def _x_values(values):
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype="float64")
+    return np.arange(len(values))
+
+
+def downsample(data, n_out, x=None, columns=None, method=DOWNSAMPLE_METHOD):
+    """
+    Rows of `data` (Series or DataFrame, in x order) kept by `method`
+    for a chart `n_out` points wide.
+
+    x:       column holding the x values (default: the index)
+    columns: y columns to preserve (default: every numeric column);
+             the kept rows are the union over those columns
+    NaN values are skipped, so they never drive a selection.
+    """
+    if len(data) <= n_out:
+        return data
+
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    x_values = _x_values(frame[x] if x is not None else frame.index)
+
+    if columns is None:
+        columns = [
+            column for column in frame.columns
+            if column != x and pd.api.types.is_numeric_dtype(frame[column])
+        ]
+
+    keep = []
+    for column in columns:
+        y = frame[column].to_numpy(dtype="float64", na_value=np.nan)
+        finite = np.flatnonzero(np.isfinite(y))
+
+        if method == "minmax":
+            picked = minmax_indices(y[finite], n_out)
+        else:
+            picked = lttb_indices(x_values[finite], y[finite], n_out)
+        keep.append(finite[picked])
+
+    if not keep:
+        return data
+
+    return data.iloc[np.unique(np.concatenate(keep))]
+
+
+def chart_data(data, width_px=DEFAULT_CHART_WIDTH, **kwargs):
+    """
+    `data` reduced to about one point per pixel of a `width_px` wide
+    chart, unless "Full-resolution charts" is ticked in the sidebar.
+    """
+    if st.session_state.get("full_resolution"):
+        return data
+    return downsample(data, width_px, **kwargs)
@@ -1,12 +1,26 @@
 import streamlit as st
 import pandas as pd
 
+from utils.data_loader import (
+    dataset_version, footprint_summary, load_ticker_index, memory_footprint,
+    query_store, store_date_range, store_tickers, using_store,
+)
+from utils.prefetch import prefetch_page_results
+
 def apply_global_filters(df: pd.DataFrame) -> pd.DataFrame:
     st.sidebar.header("Global Filters")
 
-    # Date filter
-    min_date = df["date"].min()
-    max_date = df["date"].max()
+    # Date filter (store backend: bounds come from the store, nothing is loaded yet)
+    if using_store():
+        min_date, max_date = store_date_range()
+    else:
+        min_date = df["date"].min()
+        max_date = df["date"].max()
+
+    # Empty dataset (store or files): no bounds for the date picker
+    if pd.isna(min_date) or pd.isna(max_date):
+        st.warning("No data available. Run the ETL pipeline first.")
+        st.stop()
 
     date_range = st.sidebar.date_input(
         "Select Date Range",
@@ -15,19 +29,63 @@ def apply_global_filters(df: pd.DataFrame) -> pd.DataFrame:
         max_value=max_date
     )
 
+    start_date = end_date = None
+
     if len(date_range) == 2:
         start_date, end_date = pd.to_datetime(date_range)
-        df = df[(df["date"] >= start_date) & (df["date"] <= end_date)]
+
+    if using_store():
+        tickers = store_tickers(start_date, end_date)
+    else:
+        # Row ranges come from binary searches inside each ticker block
+        # of the pre-sorted frame, instead of full-length boolean masks
+        index = load_ticker_index()
+        in_range = index.ranges(start_date, end_date)
+        tickers = [ticker for ticker, _, _ in in_range]
 
     # Ticker filter
-    tickers = sorted(df["Ticker"].unique())
     selected_tickers = st.sidebar.multiselect(
         "Select Stocks",
         options=tickers,
         default=tickers
     )
 
-    if selected_tickers:
-        df = df[df["Ticker"].isin(selected_tickers)]
+    if using_store():
+        # Date range + tickers pushed down as SQL predicates
+        # (an all-tickers selection needs no IN list)
+        pushed_tickers = selected_tickers if len(selected_tickers) < len(tickers) else ()
+        df = query_store(start_date, end_date, pushed_tickers)
+
+        total_mb = memory_footprint(df)["bytes"].sum() / 1024 ** 2
+        st.sidebar.caption(f"Dataset: {len(df):,} rows · {total_mb:.2f} MB pulled from SQLite store")
+    else:
+        if selected_tickers:
+            selected = set(selected_tickers)
+            in_range = [r for r in in_range if r[0] in selected]
+
+        # Already sorted by Ticker + date
+        df = index.take(df, in_range)
+
+        st.sidebar.caption(f"Dataset: {footprint_summary()}")
+
+    # Long line charts are downsampled to the chart width (utils/downsample.py)
+    st.sidebar.checkbox(
+        "Full-resolution charts",
+        key="full_resolution",
+        help="Plot every data point. Useful when zoomed into a narrow date range; "
+             "otherwise long series are reduced to about one point per pixel."
+    )
+
+    # Identifies this filter state for the page cache (see utils/memo.py)
+    filter_key = (
+        dataset_version(),
+        tuple(str(d) for d in date_range),
+        tuple(sorted(selected_tickers))
+    )
+    st.session_state["filter_key"] = filter_key
+    st.session_state["filter_bounds"] = (start_date, end_date, tuple(selected_tickers))
+
+    # Warm every page's results for this selection in the background
+    prefetch_page_results(df, filter_key)
 
     return df
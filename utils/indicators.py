@@ -0,0 +1,183 @@
+import numpy as np
+
+from utils.ticker_index import sort_by_ticker_date
+
+# ----------------------------------------------------
+# Technical indicators for every ticker in one pass
+# The long frame (sorted by Ticker, date) is laid out as a
+# tickers × days matrix using the ticker block offsets, so:
+#   - rolling windows  → cumulative sums along the day axis
+#   - EMA / Wilder     → one recursive filter step per day,
+#                        vectorized across all tickers
+# No Python loop ever runs per ticker.
+# ----------------------------------------------------
+
+DEFAULT_PARAMS = {
+    "sma_window": 20,
+    "ema_span": 20,
+    "rsi_period": 14,
+    "bollinger_window": 20,
+    "bollinger_k": 2.0,
+    "atr_period": 14,
+    "volatility_window": 20,
+}
+
+
+class TickerLayout:
+    """
+    Row → (ticker block, position in block) mapping for a
+    (Ticker, date)-sorted frame, plus the padded matrix shape.
+    """
+
+    def __init__(self, tickers):
+        tickers = np.asarray(tickers)
+        n = len(tickers)
+
+        if n:
+            starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+        else:
+            starts = np.array([], dtype=int)
+        lengths = np.diff(np.r_[starts, n]).astype(int)
+
+        self.block = np.repeat(np.arange(len(starts)), lengths)
+        self.position = np.arange(n) - np.repeat(starts, lengths)
+        self.shape = (len(starts), int(lengths.max()) if n else 0)
+
+    def to_matrix(self, values):
+        """
+        Long values → tickers × days matrix (NaN after each ticker's last day).
+        """
+        matrix = np.full(self.shape, np.nan)
+        matrix[self.block, self.position] = values
+        return matrix
+
+    def to_long(self, matrix):
+        return matrix[self.block, self.position]
+
+
+# ----------------------------------------------------
+# Matrix primitives (rows = tickers, columns = days)
+# ----------------------------------------------------
+
+def _window_sum(matrix, window):
+    """
+    Trailing `window`-day sums via cumulative sums; NaN until a full window.
+    """
+    running = np.cumsum(np.nan_to_num(matrix), axis=1)
+    result = running.copy()
+    result[:, window:] -= running[:, :-window]
+
+    # Needs `window` observed values, like rolling(window)
+    observed = np.cumsum(np.isfinite(matrix), axis=1)
+    count = observed.copy()
+    count[:, window:] -= observed[:, :-window]
+
+    result[count < window] = np.nan
+    return result
+
+
+def _rolling_mean_std(matrix, window):
+    """
+    Rolling mean + sample std (ddof=1). Values are shifted by each
+    ticker's first value first, which keeps the running sums small.
+    """
+    offset = np.nan_to_num(matrix[:, :1])
+    shifted = matrix - offset
+
+    sums = _window_sum(shifted, window)
+    sum_sq = _window_sum(shifted ** 2, window)
+
+    mean = sums / window
+    var = np.maximum(sum_sq - sums * mean, 0.0) / (window - 1)
+    return mean + offset, np.sqrt(var)
+
+
+def _ewm(matrix, alpha):
+    """
+    Recursive filter y_t = α·x_t + (1 − α)·y_{t−1} along the day axis,
+    started at each ticker's first observed value
+    (= ewm(alpha=α, adjust=False) with leading NaNs skipped).
+    """
+    result = np.full(matrix.shape, np.nan)
+    state = np.full(matrix.shape[0], np.nan)
+
+    for day in range(matrix.shape[1]):
+        x = matrix[:, day]
+        updated = alpha * x + (1 - alpha) * state
+        state = np.where(np.isnan(state), x, np.where(np.isnan(x), state, updated))
+        result[:, day] = state
+
+    return result
+
+
+def _previous(matrix):
+    shifted = np.full(matrix.shape, np.nan)
+    shifted[:, 1:] = matrix[:, :-1]
+    return shifted
+
+
+# ----------------------------------------------------
+# Indicators
+# ----------------------------------------------------
+
+def compute_indicators(df, params=None):
+    """
+    Long frame with Ticker, date, close and one column per indicator:
+    sma, ema, rsi, bb_middle / bb_upper / bb_lower, atr, volatility.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    df = sort_by_ticker_date(df)
+
+    layout = TickerLayout(df["Ticker"].to_numpy())
+    close = layout.to_matrix(df["close"].to_numpy(dtype="float64"))
+    high = layout.to_matrix(df["high"].to_numpy(dtype="float64"))
+    low = layout.to_matrix(df["low"].to_numpy(dtype="float64"))
+    prev_close = _previous(close)
+
+    indicators = {}
+
+    # Moving averages
+    indicators["sma"], _ = _rolling_mean_std(close, params["sma_window"])
+    indicators["ema"] = _ewm(close, 2 / (params["ema_span"] + 1))
+
+    # RSI (Wilder smoothing of gains / losses)
+    delta = close - prev_close
+    avg_gain = _ewm(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0)), 1 / params["rsi_period"])
+    avg_loss = _ewm(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0)), 1 / params["rsi_period"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi[(avg_loss == 0) & (avg_gain > 0)] = 100.0
+    indicators["rsi"] = rsi
+
+    # Bollinger bands
+    middle, std = _rolling_mean_std(close, params["bollinger_window"])
+    indicators["bb_middle"] = middle
+    indicators["bb_upper"] = middle + params["bollinger_k"] * std
+    indicators["bb_lower"] = middle - params["bollinger_k"] * std
+
+    # ATR: Wilder average of the true range (high − low on each first day)
+    true_range = np.fmax(
+        high - low,
+        np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+    indicators["atr"] = _ewm(true_range, 1 / params["atr_period"])
+
+    # Rolling volatility of daily returns
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily_return = close / prev_close - 1
+    _, indicators["volatility"] = _rolling_mean_std(daily_return, params["volatility_window"])
+
+    result = df[["Ticker", "date", "close"]].copy()
+    for name, matrix in indicators.items():
+        result[name] = layout.to_long(matrix)
+
+    return result
+
+
+def latest_snapshot(indicators):
+    """
+    Last row per ticker (one vectorized take using the block ends).
+    """
+    tickers = indicators["Ticker"].to_numpy()
+    last = np.flatnonzero(np.r_[tickers[1:] != tickers[:-1], True]) if len(tickers) else []
+    return indicators.iloc[last].reset_index(drop=True).astype({"Ticker": str})
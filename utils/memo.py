@@ -0,0 +1,102 @@
+import time
+import threading
+from collections import OrderedDict
+
+# ----------------------------------------------------
+# Filter-keyed memoization of page computations
+# Keys look like:
+#   (dataset version, date range, sorted tickers, name, params)
+# so any repeated filter state is served without recomputing.
+# ----------------------------------------------------
+
+DEFAULT_MAXSIZE = 64
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache with hit / miss counters.
+    Shared by the page threads and the prefetch pool.
+    With `ttl` (seconds), entries also expire that long after being stored.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key → (value, expires_at)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key):
+        """
+        (True, value) on a hit (and mark it most recent), else (False, None).
+        """
+        with self._lock:
+            if key in self._entries:
+                value, expires_at = self._entries[key]
+
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+
+                del self._entries[key]
+
+            self.misses += 1
+            return False, None
+
+    def store(self, key, value):
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            # Evict least recently used entries beyond maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute, *args):
+        hit, value = self.lookup(key)
+        if hit:
+            return value
+
+        value = compute(*args)
+        self.store(key, value)
+        return value
+
+    def invalidate(self, predicate):
+        """
+        Drop every entry whose key matches `predicate`; returns how many.
+        """
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+
+# One cache per dashboard process: identical filter states are shared
+# across sessions because the key includes the dataset version.
+PAGE_CACHE = LRUCache()
+
+
+def memo_key(filter_key, name, *params):
+    return (filter_key, name, params)
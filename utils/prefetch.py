@@ -0,0 +1,104 @@
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.analytics import PAGE_COMPUTATIONS, AnalyticsContext
+from utils.data_loader import price_index_for
+from utils.memo import PAGE_CACHE, memo_key
+from utils.profiling import PAGE_PROFILER
+
+# One small pool per dashboard process, shared by all sessions
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="page-prefetch")
+
+
+def analytics_context(df):
+    """
+    AnalyticsContext for the filtered frame `df`: one per filter state,
+    shared by every page and session (st.cache_resource), so the sorted
+    returns frame and the date × Ticker pivot are built once.
+    """
+    filter_key = st.session_state.get("filter_key")
+    if filter_key is None:
+        return AnalyticsContext(df)
+
+    return _shared_context(filter_key, df)
+
+
+@st.cache_resource(max_entries=32)
+def _shared_context(filter_key, _df):
+    # Keyed on the filter state alone (which includes the dataset version)
+    return AnalyticsContext(_df)
+
+
+def prefetch_page_results(df, filter_key):
+    """
+    When the global filter selection changes, start computing every
+    page's results in the background and keep the futures in the session.
+    Results land in PAGE_CACHE; already-cached ones are not recomputed.
+    """
+    if st.session_state.get("prefetch_key") == filter_key:
+        return
+
+    context = analytics_context(df)
+
+    st.session_state["prefetch_key"] = filter_key
+    st.session_state["prefetch_results"] = {
+        name: _EXECUTOR.submit(
+            PAGE_CACHE.get_or_compute, memo_key(filter_key, name),
+            PAGE_PROFILER.profiled(name, compute), context
+        )
+        for name, compute in PAGE_COMPUTATIONS.items()
+    }
+
+
+def get_page_result(name, df):
+    """
+    Result of PAGE_COMPUTATIONS[name] for the current filters:
+    served from the prefetch when available, computed inline otherwise.
+    """
+    future = st.session_state.get("prefetch_results", {}).get(name)
+
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            pass   # e.g. missing sector mapping → let the page surface it
+
+    return memoized(name, PAGE_COMPUTATIONS[name], analytics_context(df))
+
+
+def memoized(name, compute, *args, params=()):
+    """
+    compute(*args), cached under the current filter state + params.
+    Without a filter state (page run outside the dashboard) it just computes.
+    Cache misses are profiled when STOCK_PROFILE=1.
+    """
+    compute = PAGE_PROFILER.profiled(name, compute)
+
+    filter_key = st.session_state.get("filter_key")
+    if filter_key is None:
+        return compute(*args)
+
+    return PAGE_CACHE.get_or_compute(memo_key(filter_key, name, *params), compute, *args)
+
+
+def get_window_returns(df):
+    """
+    Per-ticker return over the current global filter window (the filtered
+    frame `df`), answered by the PriceIndex (binary searches, no groupby).
+    """
+    start_date, end_date, tickers = st.session_state.get("filter_bounds", (None, None, ()))
+    return memoized(
+        "window_returns",
+        lambda: price_index_for(df).window_returns(start_date, end_date, tickers)
+    )
+
+
+def get_monthly_returns(df):
+    """
+    Ticker × month returns matrix over the current global filter window.
+    """
+    start_date, end_date, tickers = st.session_state.get("filter_bounds", (None, None, ()))
+    return memoized(
+        "monthly_returns",
+        lambda: price_index_for(df).monthly_returns(start_date, end_date, tickers)
+    )
@@ -0,0 +1,223 @@
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------
+# Per-ticker price index for arbitrary-window returns
+# Rows of the loaded frame (sorted by Ticker, date) are addressed by a
+# composite key  ticker_code * span + seconds_since_first_date,
+# so the first / last row of any [start, end] window is one
+# searchsorted per ticker — vectorized across all tickers at once.
+# ----------------------------------------------------
+
+
+class PriceIndex:
+    """
+    Sorted composite keys + close prices + running volume sums / counts.
+    Built once per loaded dataset.
+    """
+
+    def __init__(self, df):
+        tickers = df["Ticker"].to_numpy()
+        n = len(df)
+
+        if n:
+            starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+        else:
+            starts = np.array([], dtype=int)
+        lengths = np.diff(np.r_[starts, n]).astype(int)
+
+        self.tickers = np.array([str(t) for t in tickers[starts]], dtype=object)
+        self.codes = {ticker: code for code, ticker in enumerate(self.tickers)}
+
+        seconds = df["date"].to_numpy().astype("datetime64[s]").astype("int64")
+        self.origin = int(seconds.min()) if n else 0
+        self.span = int(seconds.max()) - self.origin + 1 if n else 1
+
+        codes = np.repeat(np.arange(len(starts)), lengths)
+        self.keys = codes * self.span + (seconds - self.origin)
+
+        self.dates = df["date"].to_numpy()
+        self.close = df["close"].to_numpy(dtype="float64")
+        # Missing volumes add 0 to the sums and are left out of the counts,
+        # so average volume skips them like groupby().mean() does
+        volume = df["volume"].to_numpy(dtype="float64", na_value=np.nan)
+        has_volume = ~np.isnan(volume)
+        self.volume_sums = np.r_[0, np.cumsum(np.where(has_volume, volume, 0))]
+        self.volume_counts = np.r_[0, np.cumsum(has_volume)]
+
+    # ---------------------------------------------------------
+    # 1. WINDOW LOOKUP
+    # ---------------------------------------------------------
+    def _offset(self, when, low, high):
+        seconds = pd.Timestamp(when).to_datetime64().astype("datetime64[s]").astype("int64")
+        return int(np.clip(seconds - self.origin, low, high))
+
+    def _start_offset(self, start_date):
+        # Clamped into [0, span] so the key never reaches the previous ticker
+        return 0 if start_date is None else self._offset(start_date, 0, self.span)
+
+    def _end_offset(self, end_date):
+        # Clamped into [-1, span - 1] so the key never reaches the next ticker
+        return self.span - 1 if end_date is None else self._offset(end_date, -1, self.span - 1)
+
+    def _codes(self, tickers=None):
+        if not tickers:
+            return np.arange(len(self.tickers))
+        return np.array(sorted(self.codes[t] for t in tickers if t in self.codes), dtype="int64")
+
+    def bounds(self, codes, start_date=None, end_date=None):
+        """
+        First / last row position of each ticker inside [start_date, end_date]
+        (inclusive). `codes` and the dates broadcast together, so a
+        tickers × periods grid of windows is one pair of searchsorted calls.
+        """
+        start = self._start_offset(start_date)
+        end = self._end_offset(end_date)
+
+        lo = np.searchsorted(self.keys, codes * self.span + start, side="left")
+        hi = np.searchsorted(self.keys, codes * self.span + end, side="right") - 1
+        return lo, hi
+
+    # ---------------------------------------------------------
+    # 2. RETURNS OVER ONE WINDOW
+    # ---------------------------------------------------------
+    def window_returns(self, start_date=None, end_date=None, tickers=None):
+        """
+        First / last close per ticker in the window, average volume and
+        the window return (same columns as analytics.yearly_returns).
+        Tickers without rows in the window are left out.
+        """
+        codes = self._codes(tickers)
+        lo, hi = self.bounds(codes, start_date, end_date)
+
+        has_rows = hi >= lo
+        codes, lo, hi = codes[has_rows], lo[has_rows], hi[has_rows]
+
+        start_price = self.close[lo]
+        end_price = self.close[hi]
+
+        volume_count = self.volume_counts[hi + 1] - self.volume_counts[lo]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_volume = (self.volume_sums[hi + 1] - self.volume_sums[lo]) / volume_count
+
+        return pd.DataFrame({
+            "Ticker": self.tickers[codes].astype(str),
+            "start_price": start_price,
+            "end_price": end_price,
+            "avg_volume": avg_volume,
+            "yearly_return": (end_price - start_price) / start_price,
+        })
+
+    # ---------------------------------------------------------
+    # 3. RETURNS OVER MANY WINDOWS (tickers × periods)
+    # ---------------------------------------------------------
+    def windows_returns(self, windows, tickers=None):
+        """
+        Ticker × window matrix of returns for a list of
+        (label, start, end) windows; NaN where a ticker has no rows.
+        """
+        codes = self._codes(tickers)
+        labels = [label for label, _, _ in windows]
+
+        if not windows or not len(codes):
+            return pd.DataFrame(index=self.tickers[codes].astype(str), columns=labels, dtype="float64")
+
+        starts = np.array([self._start_offset(s) for _, s, _ in windows])
+        ends = np.array([self._end_offset(e) for _, _, e in windows])
+
+        base = codes[:, None] * self.span
+        lo = np.searchsorted(self.keys, base + starts[None, :], side="left")
+        hi = np.searchsorted(self.keys, base + ends[None, :], side="right") - 1
+
+        has_rows = hi >= lo
+        lo_safe, hi_safe = np.where(has_rows, lo, 0), np.where(has_rows, hi, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = self.close[hi_safe] / self.close[lo_safe] - 1
+        returns[~has_rows] = np.nan
+
+        return pd.DataFrame(returns, index=self.tickers[codes].astype(str), columns=labels)
+
+    def monthly_returns(self, start_date=None, end_date=None, tickers=None):
+        """
+        Return of every ticker in every calendar month of the range
+        (first to last close inside the month, clipped to the range).
+        """
+        windows = []
+        for month_start in self._month_starts(start_date, end_date):
+            month_end = month_start + pd.offsets.MonthBegin(1) - pd.Timedelta(seconds=1)
+            windows.append((
+                month_start.strftime("%Y-%m"),
+                max(month_start, pd.Timestamp(start_date)) if start_date is not None else month_start,
+                min(month_end, pd.Timestamp(end_date)) if end_date is not None else month_end,
+            ))
+        return self.windows_returns(windows, tickers)
+
+    def sliding_returns(self, window_days, step_days=1, start_date=None, end_date=None, tickers=None):
+        """
+        Returns over trailing `window_days`-day windows ending every
+        `step_days` days across the range.
+        """
+        first = pd.Timestamp(start_date) if start_date is not None else pd.Timestamp(self.dates.min())
+        last = pd.Timestamp(end_date) if end_date is not None else pd.Timestamp(self.dates.max())
+
+        windows = []
+        for window_end in pd.date_range(first + pd.Timedelta(days=window_days), last, freq=f"{step_days}D"):
+            windows.append((window_end.normalize(), window_end - pd.Timedelta(days=window_days), window_end))
+        return self.windows_returns(windows, tickers)
+
+    def _month_starts(self, start_date, end_date):
+        if not len(self.dates):
+            return []
+        first = pd.Timestamp(start_date) if start_date is not None else pd.Timestamp(self.dates.min())
+        last = pd.Timestamp(end_date) if end_date is not None else pd.Timestamp(self.dates.max())
+        return pd.date_range(first.to_period("M").to_timestamp(), last, freq="MS")
+
+
+# ----------------------------------------------------
+# Top-K selection (partial sort)
+# ----------------------------------------------------
+
+def top_k(frame, column, k, largest=True):
+    """
+    The k rows with the largest (or smallest) `column`, ordered.
+    argpartition finds them in O(n); only those k rows get sorted.
+    """
+    values = frame[column].to_numpy(dtype="float64")
+    k = min(k, len(values))
+    if k == 0:
+        return frame.iloc[:0]
+
+    # NaNs rank last (returned only when fewer than k values are set)
+    keys = np.where(np.isnan(values), np.inf, -values if largest else values)
+    chosen = np.argpartition(keys, k - 1)[:k]
+    chosen = chosen[np.argsort(keys[chosen], kind="stable")]
+    return frame.iloc[chosen]
+
+
+def period_leaders(returns_matrix, k=1, largest=True):
+    """
+    Top-k tickers per period column of a ticker × period returns matrix,
+    as a long frame (period, rank, Ticker, return).
+    """
+    values = returns_matrix.to_numpy(dtype="float64")
+    n_tickers = values.shape[0]
+    k = min(k, n_tickers)
+    if k == 0:
+        return pd.DataFrame(columns=["period", "rank", "Ticker", "return"])
+
+    keys = np.where(np.isnan(values), np.inf, -values if largest else values)
+    chosen = np.argpartition(keys, k - 1, axis=0)[:k]
+    order = np.take_along_axis(keys, chosen, axis=0).argsort(axis=0, kind="stable")
+    chosen = np.take_along_axis(chosen, order, axis=0)
+
+    periods = np.tile(np.asarray(returns_matrix.columns, dtype=object), k)
+    rows = chosen.ravel()
+    cols = np.tile(np.arange(values.shape[1]), k)
+
+    leaders = pd.DataFrame({
+        "period": periods,
+        "rank": np.repeat(np.arange(1, k + 1), values.shape[1]),
+        "Ticker": returns_matrix.index.to_numpy()[rows],
+        "return": values[rows, cols],
+    })
+    return leaders.dropna(subset=["return"]).sort_values(["period", "rank"]).reset_index(drop=True)
@@ -0,0 +1,153 @@
+import os
+import re
+import sys
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+# ----------------------------------------------------
+# Opt-in profiling of ETL stages and page computations
+# STOCK_PROFILE=1 (or run_etl.py --profile) wraps each stage in
+# cProfile + tracemalloc and writes, per stage, into
+#   profiles/<label>_<YYYYmmdd_HHMMSS>/
+#     <stage>.pstats       (python -m pstats / snakeviz)
+#     <stage>.alloc.txt    (peak + top allocation sites)
+# Disabled (the default), stage() is a shared no-op context.
+# ----------------------------------------------------
+
+PROFILE_ENABLED = os.environ.get("STOCK_PROFILE", "0") not in ("", "0")
+PROFILE_ROOT = os.environ.get("STOCK_PROFILE_DIR", "profiles")
+TOP_ALLOCATIONS = 25
+
+_DISABLED = nullcontext()
+
+
+class Profiler:
+    """
+    Per-stage cProfile + tracemalloc dumps into one timestamped directory.
+
+    Only one stage is profiled at a time (tracemalloc is process-wide):
+    stages on other threads (prefetch pool) wait for it to finish, and
+    stages nested inside it are accounted to it. Repeated stage names get
+    a numeric suffix (e.g. page reruns).
+    """
+
+    def __init__(self, label, enabled=PROFILE_ENABLED, root=PROFILE_ROOT):
+        self.label = label
+        self.enabled = enabled
+        self.root = Path(root)
+        self.run_dir = None
+        self._counts = {}
+        self._busy = threading.Lock()
+        self._owner = None   # thread running the profiled stage
+
+    def start(self, name):
+        """
+        Begin profiling stage `name`; returns a handle for stop()
+        (None when disabled or nested inside a profiled stage).
+        """
+        if not self.enabled or self._owner == threading.get_ident():
+            return None
+
+        self._busy.acquire()
+        self._owner = threading.get_ident()
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        profile = cProfile.Profile()
+        profile.enable()
+        return name, profile, started_tracing
+
+    def stop(self, handle):
+        """
+        End the stage started with `handle` and write its reports.
+        """
+        if handle is None:
+            return
+
+        name, profile, started_tracing = handle
+        profile.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+
+        try:
+            self._dump(name, profile, snapshot, peak)
+        finally:
+            self._owner = None
+            self._busy.release()
+
+    def stage(self, name):
+        """
+        Context manager profiling the enclosed block as stage `name`.
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name):
+        handle = self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(handle)
+
+    def profiled(self, name, func):
+        """
+        `func` wrapped in stage(name) (`func` itself when disabled).
+        """
+        if not self.enabled:
+            return func
+
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def _dump(self, name, profile, snapshot, peak):
+        if self.run_dir is None:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.run_dir = self.root / f"{self.label}_{stamp}"
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        count = self._counts[name] = self._counts.get(name, 0) + 1
+        if count > 1:
+            name = f"{name}_{count:03d}"
+
+        profile.dump_stats(self.run_dir / f"{name}.pstats")
+
+        stats = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]).statistics("lineno")
+
+        with open(self.run_dir / f"{name}.alloc.txt", "w") as f:
+            f.write(f"Stage: {name}\n")
+            f.write(f"Peak traced memory: {peak / 1024 ** 2:.2f} MB\n")
+            f.write(f"Top {TOP_ALLOCATIONS} allocation sites still held at stage end:\n\n")
+            for stat in stats[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+
+def disable_in_worker():
+    """
+    Process-pool initializer: forked workers inherit the parent's active
+    profiler hook and tracemalloc; switch both off so they run at full speed.
+    """
+    sys.setprofile(None)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+# Shared by the dashboard pages (prefetch threads included)
+PAGE_PROFILER = Profiler("dashboard")
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------
+# Per-ticker offset index over a frame sorted by (Ticker, date)
+# Each ticker owns one contiguous block of rows, so a date range
+# is two binary searches inside that block.
+# ----------------------------------------------------
+
+
+def sort_by_ticker_date(df):
+    """
+    Frame sorted by Ticker + date. Already-sorted frames (the loaded
+    dataset and every slice of it) skip the sort and are only copied.
+    """
+    if is_ticker_date_sorted(df):
+        return df.copy()
+    return df.sort_values(["Ticker", "date"])
+
+
+def is_ticker_date_sorted(df):
+    tickers = df["Ticker"].to_numpy()
+    dates = df["date"].to_numpy()
+
+    if len(df) < 2:
+        return True
+
+    same = tickers[1:] == tickers[:-1]
+    ordered = (tickers[1:] > tickers[:-1]) | same
+    return bool(ordered.all() and (dates[1:] >= dates[:-1])[same].all())
+
+
+class TickerIndex:
+    """
+    Offsets of every ticker block in a (Ticker, date)-sorted frame.
+    Built once per loaded dataset; slicing costs O(tickers · log n)
+    to resolve the row ranges.
+    """
+
+    def __init__(self, df):
+        tickers = df["Ticker"].to_numpy()
+        self.dates = df["date"].to_numpy()
+
+        # Block boundaries: rows where the ticker changes
+        if len(df):
+            starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+        else:
+            starts = np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(df)].astype(int)
+
+        self.tickers = [str(t) for t in tickers[starts]]
+        self.blocks = dict(zip(self.tickers, zip(starts, ends)))
+
+    def ranges(self, start_date=None, end_date=None, tickers=None):
+        """
+        (ticker, lo, hi) row ranges for `tickers` (all if empty / None)
+        with start_date <= date <= end_date; empty ranges are dropped.
+        """
+        # Bounds in the frame's own datetime unit, so searchsorted compares like with like
+        if start_date is not None:
+            start_date = pd.Timestamp(start_date).to_datetime64().astype(self.dates.dtype)
+        if end_date is not None:
+            end_date = pd.Timestamp(end_date).to_datetime64().astype(self.dates.dtype)
+
+        result = []
+        for ticker in (tickers or self.tickers):
+            if ticker not in self.blocks:
+                continue
+
+            lo, hi = self.blocks[ticker]
+            block = self.dates[lo:hi]
+
+            if start_date is not None:
+                lo += np.searchsorted(block, start_date, side="left")
+            if end_date is not None:
+                hi = self.blocks[ticker][0] + np.searchsorted(block, end_date, side="right")
+
+            if hi > lo:
+                result.append((ticker, lo, hi))
+
+        # Keep the frame's (Ticker, date) order whatever the selection order was
+        result.sort(key=lambda r: r[1])
+        return result
+
+    def take(self, df, ranges):
+        """
+        Rows of `df` covered by `ranges`, already sorted by Ticker + date.
+        """
+        if not ranges:
+            return df.iloc[:0]
+
+        positions = np.concatenate([np.arange(lo, hi) for _, lo, hi in ranges])
+        return df.iloc[positions]